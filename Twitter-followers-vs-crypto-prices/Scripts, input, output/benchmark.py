@@ -0,0 +1,281 @@
+# --------------------------------------------------------------------------------------------------------------
+# benchmark.py:
+# Benchmark suite timing each stage of the project separately (html parsing, frame assembly, transforms, correlation
+# matrices, lagged correlations and figure rendering) on the fixture pages in Benchmarks/Fixtures and on synthetic
+# data of several sizes (see synthetic.py). Results are saved as JSON, and two result files can be compared to find
+# regressions. Also times the original BeautifulSoup parsing code against the targeted extraction in extraction.py.
+# The fixture pages are synthetic (built by fixtures.py from the collected data, not saved from the websites), so the
+# parsing timings only hold for the layout fixtures.py writes. Nothing here checks that the two parsing
+# implementations give the same values on pages saved from the websites.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import argparse
+import contextlib
+import datetime as dt
+import glob
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import numpy as np
+import pandas as pd
+import matplotlib
+from bs4 import BeautifulSoup
+import extraction
+import figures
+import scraper
+from correlation import correlationMatrix, laggedCorrelation
+from dataset import Dataset
+from incremental import loadFrame, mergeFrame, newRows
+import synthetic
+from synthetic import parseScale, syntheticFrames
+from transforms import normalize, rescale
+
+
+# legacyFollowers: the original parsing code of scraper.scrapeFollowers, kept as the benchmark baseline
+def legacyFollowers(html):
+    soup = BeautifulSoup(html, features="html.parser")
+    n = 1
+    totalFollowers = []
+    for item in soup.find_all("div", {"style": "width: 120px; float: left;"}):
+        if n % 2 == 0 and 2 < n < 60:
+            totalFollowers.append(
+                re.findall(r"\d+", str(item.contents).replace("[", "").replace("]", "").replace(",", "")).pop())
+        n += 1
+    n = 1
+    newFollowers = []
+    for item in soup.find_all("div", {"style": "width: 100px; float: left;"}):
+        if 1 < n < 30:
+            newFollowers.append(re.findall(r"((?:(?<=\+)\d+|-)\d*)", str(item.contents).replace(",", "")).pop())
+        n += 1
+    return totalFollowers, newFollowers
+
+
+# legacyPrices: the original parsing code of scraper.scrapePrices, kept as the benchmark baseline
+def legacyPrices(html):
+    soup = BeautifulSoup(html, features="html.parser")
+    n = 1
+    prices = []
+    for item in soup.find_all("td"):
+        if n % 7 == 2 and 15 < n < 206:
+            prices = [float(item.contents.pop().replace(",", ""))] + prices
+        n += 1
+    return prices
+
+
+# timePerCall: returns the best average time of a call over several repeats, in milliseconds
+def timePerCall(function, html, number=20, repeat=5):
+    return min(timeit.repeat(lambda: function(html), number=number, repeat=repeat)) / number * 1000
+
+
+# benchmarkParsing: prints the timings of both parsing implementations on every fixture page (the synthetic pages of
+# fixtures.py, unless pages saved from the websites replaced them). The timings don't compare their results.
+def benchmarkParsing(fixtureDirectory="./Benchmarks/Fixtures"):
+    backends = ["html.parser"] + (["lxml"] if extraction.lxml is not None else [])
+    print("Fixture pages in " + fixtureDirectory + " (synthetic pages built by fixtures.py unless replaced by saved "
+          "ones, so layout changes of the websites aren't detected; only timings are compared, not parsed values)")
+    print("{:<40}{:>12}{:>12}".format("Page / implementation", "ms per page", "speedup"))
+    for path in sorted(glob.glob(os.path.join(fixtureDirectory, "*.html"))):
+        with open(path, "r") as file:
+            html = file.read()
+        if os.path.basename(path).startswith("socialblade"):
+            legacy, fast = legacyFollowers, extraction.extractFollowers
+        else:
+            legacy, fast = legacyPrices, extraction.extractPrices
+        baseline = timePerCall(legacy, html)
+        print(os.path.basename(path))
+        print("{:<40}{:>12.2f}{:>12}".format("  original (BeautifulSoup + regex)", baseline, "1.0x"))
+        for backend in backends:
+            elapsed = timePerCall(lambda html: fast(html, backend), html)
+            print("{:<40}{:>12.2f}{:>11.1f}x".format("  extraction (" + backend + ")", elapsed, baseline / elapsed))
+
+
+# stageNames: the stages timed by the benchmark suite, in order. Parsing runs on the fixture pages, the other stages
+# on synthetic data of each scale.
+stageNames = ["parsing", "assembly", "transforms", "correlation", "laggedCorrelation", "rendering"]
+
+# renderedFigures: the figures timed by the rendering stage (one of each kind of plot)
+renderedFigures = ["totalFollowers", "followersVsPrices", "normalizedTotalFollowersBySize", "totalFollowersMatrix",
+                   "totalFollowersLags"]
+
+
+# FixtureFetcher: a fetch backend for scraper.py that serves the fixture pages instead of downloading them. The
+# Twitter accounts and cryptocurrencies with a fixture page are listed in twitters and cryptos.
+class FixtureFetcher:
+    def __init__(self, fixtureDirectory="./Benchmarks/Fixtures"):
+        self.pages = {}
+        self.twitters = []
+        self.cryptos = []
+        for path in sorted(glob.glob(os.path.join(fixtureDirectory, "*.html"))):
+            site, _, name = os.path.basename(path)[:-len(".html")].partition("-")
+            if site == "socialblade":
+                self.twitters.append(name)
+                URL = scraper.followersURL(name)
+            else:
+                self.cryptos.append(name)
+                URL = scraper.pricesURL(name)
+            with open(path, "r") as file:
+                self.pages[URL] = file.read()
+
+    # fetch: returns the fixture page of a URL
+    def fetch(self, URL):
+        return self.pages[URL]
+
+
+# timeStage: runs a function `repeat` times and returns its best and median time in seconds
+def timeStage(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"seconds": min(times), "median": statistics.median(times), "runs": repeat}
+
+
+# parsingStage: scrapes every fixture page with scraper.scrapeFollowers and scraper.scrapePrices
+def parsingStage(fetcher):
+    with contextlib.redirect_stdout(io.StringIO()):  # (scraper.fetchWebpage prints its progress)
+        for twitter in fetcher.twitters:
+            scraper.scrapeFollowers(twitter, fetcher)
+        for crypto in fetcher.cryptos:
+            scraper.scrapePrices(crypto, fetcher)
+
+
+# assemblyStage: builds the three dataframes from scraped values the way scraper.run does (newRows for the entities
+# of each frame, then mergeFrame)
+def assemblyStage(dates, prices, totals, changes):
+    empty = loadFrame(None)
+    for values in [prices, totals, changes]:
+        mergeFrame(empty, newRows(empty, dates, values))
+
+
+# scaleStages: returns the functions timing each stage on synthetic data of a scale (except parsing), with the data
+# they need prepared beforehand
+def scaleStages(accounts, days, coins, directory, lineMode):
+    cryptoPricesDF, totalFollowersDF, newFollowersDF = syntheticFrames(accounts, days, coins)
+    dates = list(totalFollowersDF.index)
+    scraped = [{name: frame[name].to_numpy() for name in frame.columns}
+               for frame in [cryptoPricesDF, totalFollowersDF, newFollowersDF]]
+    dataset = Dataset({"cryptoPrices": cryptoPricesDF, "totalFollowers": totalFollowersDF,
+                       "newFollowers": newFollowersDF})
+
+    # (the rendering stage only times drawing: the frames the figures use are computed beforehand)
+    def rendering():
+        for name in renderedFigures:
+            figures.renderFigure(figures.registry[name], dataset, directory, lineMode=lineMode)
+
+    def prepareRendering():
+        for name in renderedFigures:
+            figures.registry[name].data(dataset)
+
+    stages = {
+        "assembly": lambda: assemblyStage(dates, *scraped),
+        "transforms": lambda: [transform(frame) for transform in [rescale, normalize]
+                               for frame in [cryptoPricesDF, totalFollowersDF, newFollowersDF]],
+        "correlation": lambda: [correlationMatrix(cryptoPricesDF, frame) for frame in [totalFollowersDF,
+                                                                                       newFollowersDF]],
+        "laggedCorrelation": lambda: [laggedCorrelation(cryptoPricesDF, frame, range(-7, 8))
+                                      for frame in [totalFollowersDF, newFollowersDF]],
+        "rendering": rendering,
+    }
+    return stages, prepareRendering
+
+
+# runSuite: times the stages on the fixture pages and on synthetic data of each scale, printing each result.
+# Returns the results as a dictionary that can be saved as JSON.
+def runSuite(scaleNames, stages=stageNames, repeat=3, lineMode="auto", fixtureDirectory="./Benchmarks/Fixtures"):
+    results = []
+
+    def record(stage, scale, timing):
+        results.append(dict(stage=stage, scale=scale, **timing))
+        print("{:<20}{:<22}{:>12.4f}{:>12.4f}".format(stage, scale, timing["seconds"], timing["median"]))
+
+    print("{:<20}{:<22}{:>12}{:>12}".format("Stage", "Scale", "best (s)", "median (s)"))
+    if "parsing" in stages:
+        fetcher = FixtureFetcher(fixtureDirectory)
+        record("parsing", str(len(fetcher.pages)) + " fixture pages", timeStage(lambda: parsingStage(fetcher), repeat))
+    with tempfile.TemporaryDirectory() as directory:
+        for scaleName in scaleNames:
+            accounts, days, coins = parseScale(scaleName)
+            scale = str(accounts) + "x" + str(days) + "x" + str(coins)
+            scaleFunctions, prepareRendering = scaleStages(accounts, days, coins, directory, lineMode)
+            for stage in stages:
+                if stage in scaleFunctions:
+                    if stage == "rendering":
+                        prepareRendering()
+                    record(stage, scale, timeStage(scaleFunctions[stage], repeat))
+    return {"metadata": {"date": dt.datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                         "platform": platform.platform(), "numpy": np.__version__, "pandas": pd.__version__,
+                         "matplotlib": matplotlib.__version__, "repeat": repeat, "lineMode": lineMode},
+            "results": results}
+
+
+# compareResults: prints the best times of two result files side by side, and returns the (stage, scale) pairs that
+# became slower by more than threshold (e.g. 0.1 for 10%)
+def compareResults(old, new, threshold=0.1):
+    oldTimes = {(result["stage"], result["scale"]): result["seconds"] for result in old["results"]}
+    regressions = []
+    print("{:<20}{:<22}{:>12}{:>12}{:>10}".format("Stage", "Scale", "old (s)", "new (s)", "change"))
+    for result in new["results"]:
+        key = (result["stage"], result["scale"])
+        if key not in oldTimes:
+            continue
+        change = result["seconds"] / oldTimes[key] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  slower"
+        print("{:<20}{:<22}{:>12.4f}{:>12.4f}{:>+10.1%}".format(key[0], key[1], oldTimes[key], result["seconds"],
+                                                               change) + flag)
+    return regressions
+
+
+# main: runs the benchmark suite and saves its results, compares two result files, or compares the original and new
+# parsing code
+def main():
+    parser = argparse.ArgumentParser(description="Times each stage of the project on synthetic fixture pages and data")
+    parser.add_argument("--scales", nargs="+", default=["collected", "medium"],
+                        help="sizes of synthetic data: " + ", ".join(synthetic.scales) + " or ACCOUNTSxDAYSxCOINS")
+    parser.add_argument("--stages", nargs="+", default=stageNames, choices=stageNames)
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each stage (the best is kept)")
+    parser.add_argument("--line-mode", default="auto", choices=["auto", "lines", "collection", "bands"],
+                        help="line mode of the rendering stage (see linerender.py)")
+    parser.add_argument("--output", default=None,
+                        help="JSON file of the results (by default in Benchmarks/results, named by date)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="compare two result files (OLD NEW), or a result file with a new run (OLD)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown reported as a regression when comparing (0.1 for 10%%)")
+    parser.add_argument("--legacy-parsing", action="store_true",
+                        help="time the original parsing code against extraction.py instead")
+    arguments = parser.parse_args()
+    if arguments.legacy_parsing:
+        benchmarkParsing()
+        return
+    if arguments.compare is not None and len(arguments.compare) == 2:
+        with open(arguments.compare[0], "r") as oldFile, open(arguments.compare[1], "r") as newFile:
+            sys.exit(1 if compareResults(json.load(oldFile), json.load(newFile), arguments.threshold) else 0)
+    results = runSuite(arguments.scales, arguments.stages, arguments.repeat, arguments.line_mode)
+    output = arguments.output or os.path.join("./Benchmarks/results",
+                                              "benchmark-" + dt.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print("Results saved to " + output)
+    if arguments.compare is not None:
+        with open(arguments.compare[0], "r") as oldFile:
+            sys.exit(1 if compareResults(json.load(oldFile), results, arguments.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# --------------------------------------------------------------------------------------------------------------
+# buildcache.py:
+# Keeps track of the figures generated by matplotlib-analysis.py, so that only the figures whose data or plotting
+# parameters changed since the last run are drawn again, and images of figures that no longer exist are removed
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import hashlib
+import inspect
+import json
+import os
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.colors as mpc
+
+
+# hashFrame: fingerprint of a dataframe's dates, column names, types and values
+def hashFrame(frame):
+    digest = hashlib.sha256()
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(pd.Series(frame.index, dtype="object"), index=False).values.tobytes())
+    for column in frame.columns:
+        digest.update(pd.util.hash_pandas_object(frame[column], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+# stableRepr: text representation of a plotting parameter that is the same in every run (unlike the default repr of
+# objects such as colormaps, which includes their memory address)
+def stableRepr(value):
+    if isinstance(value, mpc.Colormap):
+        colors = value(np.linspace(0, 1, 256))
+        return "Colormap(" + value.name + ", " + hashlib.sha256(colors.tobytes()).hexdigest() + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(repr(key) + ": " + stableRepr(value[key]) for key in sorted(value)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(stableRepr(item) for item in value) + "]"
+    if callable(value):
+        try:
+            source = inspect.getsource(value)
+        except (OSError, TypeError):
+            source = value.__module__ + "." + value.__qualname__
+        # (including the values of the variables a function closes over, e.g. the size bounds of dataset.py's nodes)
+        cells = getattr(value, "__closure__", None) or []
+        return source + "".join(" " + stableRepr(cell.cell_contents) for cell in cells)
+    return repr(value)
+
+
+# nodeFingerprint: fingerprint of a node of a dataset.Dataset, combining the hashes of the collected dataframes it is
+# derived from (frameHashes, from hashFrame) with the source code of the functions computing it and its dependencies
+def nodeFingerprint(dataset, name, frameHashes):
+    if name in dataset.frames:
+        return frameHashes[name]
+    dependencies, function = dataset.nodes[name]
+    digest = hashlib.sha256((name + "\0" + stableRepr(function)).encode("utf-8"))
+    for dependency in dependencies:
+        digest.update(nodeFingerprint(dataset, dependency, frameHashes).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# fingerprint: fingerprint of a figure, combining the fingerprints of its inputs (from nodeFingerprint), its spec
+# (title, labels, ticks, options, and the source code of its transform), the source code of the function drawing it,
+# the line mode and settings of the function drawing it (e.g. the page size of heatmaps.py, if not None). Changes to
+# code that the transforms call (e.g. transforms.py) aren't detected, so the figures should be rebuilt after
+# changing it.
+def fingerprint(spec, renderer, inputFingerprints, dpi, lineMode="auto", settings=None):
+    digest = hashlib.sha256()
+    parts = [spec.name, spec.title, spec.kind, spec.xlabel, spec.ylabel, spec.ticks, spec.yticks, spec.options,
+             spec.transform, renderer, dpi, lineMode, matplotlib.__version__]
+    for part in parts + ([settings] if settings is not None else []):
+        digest.update(stableRepr(part).encode("utf-8") + b"\0")
+    for inputFingerprint in inputFingerprints:
+        digest.update(inputFingerprint.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# fingerprints: fingerprints of figure specs drawn from a dataset (a dictionary of figure name -> fingerprint),
+# hashing each of the collected dataframes they use once. renderers is the dictionary of the function drawing each
+# kind of plot, and settings a dictionary of the settings of the functions drawing some kinds of plot.
+def fingerprints(dataset, specs, renderers, dpi, lineMode="auto", settings=None):
+    settings = settings or {}
+    bases = dict.fromkeys(base for spec in specs for name in spec.inputs for base in dataset.baseFrames(name))
+    frameHashes = {name: hashFrame(dataset.frames[name]) for name in bases}
+    inputFingerprints = {spec.name: [nodeFingerprint(dataset, name, frameHashes) for name in spec.inputs]
+                         for spec in specs}
+    return {spec.name: fingerprint(spec, renderers[spec.kind], inputFingerprints[spec.name], dpi, lineMode,
+                                   settings.get(spec.kind)) for spec in specs}
+
+
+# entryFiles: the files of a manifest entry (entries written before pages were recorded have a single "file")
+def entryFiles(entry):
+    return entry["files"] if "files" in entry else [entry["file"]]
+
+
+# BuildCache: manifest of the images in `directory`, recording the files (the image, then any pages drawn with it, see
+# figures.savePages) and fingerprint of each figure when it was last drawn
+class BuildCache:
+    def __init__(self, directory="./Figures", manifestName="manifest.json"):
+        self.directory = directory
+        self.manifestPath = os.path.join(directory, manifestName)
+        self.manifest = {}
+        if os.path.exists(self.manifestPath):
+            with open(self.manifestPath, "r") as file:
+                self.manifest = json.load(file)
+
+    # isCurrent: whether a figure was last drawn with the same fingerprint and all of its files still exist
+    def isCurrent(self, name, fingerprint):
+        entry = self.manifest.get(name)
+        return entry is not None and entry["fingerprint"] == fingerprint and \
+            all(os.path.exists(os.path.join(self.directory, file)) for file in entryFiles(entry))
+
+    # record: records that a figure was drawn to files (the image first), removing the files it was previously drawn
+    # to that it no longer is (e.g. because its title includes the first date, or it has fewer pages)
+    def record(self, name, files, fingerprint):
+        previous = self.manifest.get(name)
+        self.manifest[name] = {"files": list(files), "fingerprint": fingerprint}
+        if previous is not None:
+            for file in entryFiles(previous):
+                if file not in files:
+                    self.removeImage(file)
+
+    # removeImage: deletes an image, unless another figure in the manifest is saved to the same file
+    def removeImage(self, file):
+        if any(file in entryFiles(entry) for entry in self.manifest.values()):
+            return
+        try:
+            os.remove(os.path.join(self.directory, file))
+        except FileNotFoundError:
+            pass
+
+    # removeOrphans: removes the manifest entries and files of figures that aren't in `names` (e.g. figures removed
+    # from the registry). Returns the removed files.
+    def removeOrphans(self, names):
+        orphans = [name for name in self.manifest if name not in names]
+        files = []
+        for name in orphans:
+            orphanFiles = entryFiles(self.manifest.pop(name))
+            for file in orphanFiles:
+                self.removeImage(file)
+            files += orphanFiles
+        return files
+
+    # save: writes the manifest to disk
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temporaryPath = self.manifestPath + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(temporaryPath, self.manifestPath)
@@ -0,0 +1,144 @@
+# --------------------------------------------------------------------------------------------------------------
+# cli.py:
+# Command-line entry point of the project, with one subcommand per step: scrape (collect and export the data, see
+# scraper.py), export (export data collected earlier to other formats), analyze (print the correlations, their
+# significance and the strongest pairs) and render (generate the figures), e.g. "python cli.py export --formats csv"
+# or "python cli.py render --figures '*Matrix'". Each subcommand only imports the modules it needs, so that exports
+# and analysis runs don't load the scraping stack (selenium, aiohttp, BeautifulSoup) and only render loads matplotlib.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import argparse
+import importlib
+import sys
+
+
+# analysisModule: imports matplotlib-analysis.py (whose name isn't a valid module name for an import statement)
+def analysisModule():
+    return importlib.import_module("matplotlib-analysis")
+
+
+# scrapeCommand: scrapes the data and exports it (see scraper.run), with the settings of scraper.defaultSettings
+# replaced by the options
+def scrapeCommand(argv):
+    import scraper
+    settings = scraper.defaultSettings()
+    parser = argparse.ArgumentParser(prog="cli.py scrape", description="Scrapes the data and exports it")
+    parser.add_argument("--cryptos", default=settings["cryptoList"], metavar="FILE",
+                        help="txt file listing the cryptos to scrape, one per line")
+    parser.add_argument("--twitters", default=settings["twitterList"], metavar="FILE",
+                        help="txt file listing the twitters to scrape, one per line")
+    parser.add_argument("--data", default=settings["dataDirectory"], metavar="DIRECTORY",
+                        help="folder the data is stored in")
+    parser.add_argument("--formats", nargs="+", choices=scraper.exportFormats, default=settings["formats"],
+                        help="formats to export the data to")
+    parser.add_argument("--sql-url", default=settings["sqlURL"], metavar="URL",
+                        help="SQLAlchemy URL of the database of the sql format (e.g. sqlite:///./Data/db.sqlite)")
+    parser.add_argument("--backend", choices=["selenium", "http"], default=settings["fetchBackend"],
+                        help="fetch webpages with headless browsers or without a browser")
+    parser.add_argument("--workers", type=int, default=settings["fetchWorkers"],
+                        help="number of webpages fetched at the same time")
+    parser.add_argument("--retries", type=int, default=settings["retries"], help="retries of a failed webpage")
+    parser.add_argument("--reparse-cached", action="store_true",
+                        help="only parse the webpages cached earlier today again, without fetching any")
+    parser.add_argument("--full", action="store_true",
+                        help="scrape every page instead of only the dates and accounts missing from the data")
+    parser.add_argument("--no-compact", action="store_true",
+                        help="store follower counts as int64 and prices as float64 instead of the compact layout")
+    parser.add_argument("--log", metavar="PATH", help="JSON-lines instrumentation log (a new file in DATA/logs "
+                                                      "by default)")
+    parser.add_argument("--profile", nargs="+", default=[], metavar="STAGE",
+                        help="stages to profile with cProfile (wildcards allowed, e.g. 'scrape.parse')")
+    parser.add_argument("--trace-memory", nargs="+", default=[], metavar="STAGE",
+                        help="stages whose peak memory is traced with tracemalloc (wildcards allowed)")
+    arguments = parser.parse_args(argv)
+    settings.update({"cryptoList": arguments.cryptos, "twitterList": arguments.twitters,
+                     "dataDirectory": arguments.data, "formats": arguments.formats, "sqlURL": arguments.sql_url,
+                     "fetchBackend": arguments.backend, "fetchWorkers": arguments.workers,
+                     "retries": arguments.retries, "reparseCachedPages": arguments.reparse_cached,
+                     "incrementalUpdate": not arguments.full, "compactSchema": not arguments.no_compact,
+                     "instrumentationLog": arguments.log, "profileStages": arguments.profile,
+                     "traceMemoryStages": arguments.trace_memory})
+    scraper.run(settings)
+
+
+# exportCommand: exports data collected earlier (the pickled dataframes, or the column store) to other formats
+def exportCommand(argv):
+    import os
+    import instrumentation
+    import scraper
+    from schema import metrics
+    parser = argparse.ArgumentParser(prog="cli.py export",
+                                     description="Exports the data collected earlier to other formats")
+    parser.add_argument("--formats", nargs="+", choices=scraper.exportFormats, required=True,
+                        help="formats to export the data to")
+    parser.add_argument("--data", default="./Data", metavar="DIRECTORY", help="folder the data is read from")
+    parser.add_argument("--source", choices=["pickle", "arrow"], default="pickle",
+                        help="read the pickled dataframes or the column store")
+    parser.add_argument("--output", metavar="DIRECTORY", help="folder the data is exported to (DATA by default)")
+    parser.add_argument("--sql-url", default=scraper.defaultSettings()["sqlURL"], metavar="URL",
+                        help="SQLAlchemy URL of the database of the sql format (e.g. sqlite:///./Data/db.sqlite)")
+    parser.add_argument("--since", metavar="DATE", help="only write the dates from DATE onwards to SQL")
+    parser.add_argument("--log", metavar="PATH", help="JSON-lines instrumentation log")
+    arguments = parser.parse_args(argv)
+    instrumentation.configure(arguments.log)
+    frames = {}
+    for name in metrics:
+        if arguments.source == "arrow":
+            from columnstore import readFrame
+            frames[name] = readFrame(name, os.path.join(arguments.data, "arrow-data"))
+        else:
+            from incremental import loadFrame
+            path = os.path.join(arguments.data, "pickled-data", name + "DF.pkl")
+            if not os.path.exists(path):
+                parser.error("No data collected in " + path)
+            frames[name] = loadFrame(path)
+    scraper.exportData(frames, arguments.formats, arguments.output or arguments.data, arguments.sql_url,
+                       arguments.since)
+    if arguments.log is not None:
+        instrumentation.printReport()
+
+
+# analyzeCommand: prints the correlations, their significance and the strongest pairs, without drawing figures
+def analyzeCommand(argv):
+    analysis = analysisModule()
+    parser = argparse.ArgumentParser(prog="cli.py analyze",
+                                     description="Prints the correlations, their significance and the strongest pairs")
+    analysis.addResultArguments(parser)
+    analysis.addDataArguments(parser)
+    analysis.run(analysis.checkArguments(parser, parser.parse_args(argv)), render=False)
+
+
+# renderCommand: generates the figures, without printing the results
+def renderCommand(argv):
+    analysis = analysisModule()
+    parser = argparse.ArgumentParser(prog="cli.py render", description="Generates the figures of the analysis")
+    analysis.addFigureArguments(parser)
+    analysis.addDataArguments(parser)
+    arguments = analysis.checkArguments(parser, parser.parse_args(argv))
+    if arguments.list:
+        analysis.listFigures()
+        return
+    analysis.run(arguments, analyze=False)
+
+
+# commands: the subcommands, by name
+commands = {"scrape": scrapeCommand, "export": exportCommand, "analyze": analyzeCommand, "render": renderCommand}
+
+
+# main: runs the subcommand named by the first argument with the other arguments
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="Collects and analyzes data on Twitter followers and crypto prices. "
+                                                 "Run 'cli.py COMMAND --help' for the options of a command.")
+    parser.add_argument("command", choices=list(commands))
+    if len(argv) == 0 or argv[0] not in commands:
+        parser.parse_args(argv[:1])  # (prints the usage, or the help with -h)
+    commands[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# --------------------------------------------------------------------------------------------------------------
+# columnstore.py:
+# Stores the dataframes collected by scraper.py as Arrow IPC files partitioned by month, so that
+# matplotlib-analysis.py can memory-map them and load only the columns and dates it needs
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import glob
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from schema import compactFrame, dateIndex, widenIntegers
+
+
+# partitionPath: location of the file holding one month of a frame, e.g. ./Data/arrow-data/cryptoPrices/2022-08.arrow
+def partitionPath(root, name, month):
+    return os.path.join(root, name, month + ".arrow")
+
+
+# writeFrame: writes a frame indexed by date as one uncompressed Arrow IPC file per month (uncompressed so that the
+# files can be memory-mapped). Partitions of months that are no longer in the frame are removed, except, with
+# keepEarlier=True (incremental writes), the months before the frame's first date, so that a frame missing older
+# history doesn't delete it.
+def writeFrame(frame, name, root="./Data/arrow-data", keepEarlier=False):
+    os.makedirs(os.path.join(root, name), exist_ok=True)
+    frame = compactFrame(frame, smallestInteger="int8")  # (the smallest types on disk, widened again by readFrame)
+    dates = pd.to_datetime(pd.Series(frame.index, index=frame.index))
+    months = dates.dt.strftime("%Y-%m")
+    written = set()
+    for month, partition in frame.groupby(months.values, sort=True):
+        table = pa.Table.from_pandas(partition.rename_axis("Date").reset_index(), preserve_index=False)
+        table = table.set_column(0, "Date", pc.cast(pa.array(pd.to_datetime(partition.index)), pa.date32()))
+        path = partitionPath(root, name, month)
+        temporaryPath = path + ".tmp"
+        with pa.OSFile(temporaryPath, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporaryPath, path)
+        written.add(path)
+    firstMonth = months.min() if keepEarlier and len(months) > 0 else None
+    for path in glob.glob(os.path.join(root, name, "*.arrow")):
+        if path in written or (firstMonth is not None and os.path.basename(path)[:-len(".arrow")] < firstMonth):
+            continue
+        os.remove(path)
+
+
+# columnNames: names of the columns of a frame written by writeFrame, read from the schema of its last partition
+# without loading any values (e.g. to read a frame with many columns a block of columns at a time)
+def columnNames(name, root="./Data/arrow-data"):
+    paths = sorted(glob.glob(os.path.join(root, name, "*.arrow")))
+    if len(paths) == 0:
+        raise FileNotFoundError("No data stored for " + name + " in " + root)
+    with pa.memory_map(paths[-1], "r") as source:
+        return [column for column in pa.ipc.open_file(source).schema.names if column != "Date"]
+
+
+# readFrame: reads a frame written by writeFrame, memory-mapping its files. Only the given columns (all columns if
+# None) and the dates from start to end (inclusive, either can be None) are loaded, and months outside the range
+# are skipped without being opened. Integer columns stored as int8 or int16 are read as int32 (see
+# schema.widenIntegers).
+def readFrame(name, root="./Data/arrow-data", columns=None, start=None, end=None):
+    paths = sorted(glob.glob(os.path.join(root, name, "*.arrow")))
+    if len(paths) == 0:
+        raise FileNotFoundError("No data stored for " + name + " in " + root)
+    start = pd.Timestamp(start).date() if start is not None else None
+    end = pd.Timestamp(end).date() if end is not None else None
+    partitions = []
+    for path in paths:
+        month = pd.Period(os.path.basename(path)[:-len(".arrow")], freq="M")
+        if (start is not None and month.end_time.date() < start) or \
+                (end is not None and month.start_time.date() > end):
+            continue
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select(["Date"] + [column for column in columns if column in table.column_names])
+            if start is not None:
+                table = table.filter(pc.greater_equal(table["Date"], pa.scalar(start, pa.date32())))
+            if end is not None:
+                table = table.filter(pc.less_equal(table["Date"], pa.scalar(end, pa.date32())))
+            partitions.append(table.to_pandas().set_index("Date"))
+    if len(partitions) == 0:
+        frame = pd.DataFrame(index=dateIndex([]))
+    else:
+        frame = pd.concat(partitions)
+        frame.index = dateIndex(frame.index)
+    if columns is not None:
+        frame = frame.reindex(columns=[column for column in columns if column in frame.columns])
+    return widenIntegers(frame)
+
+
+# loadFrame: loads a dataframe collected by scraper.py from dataDirectory, keeping only the specified columns (all if
+# None) and the dates from start to end (all if None). Reads the memory-mapped column store if it exists, otherwise
+# the pickled dataframe. Used by every script reading the collected data.
+def loadFrame(name, columns=None, start=None, end=None, dataDirectory="./Data"):
+    if os.path.isdir(os.path.join(dataDirectory, "arrow-data", name)):
+        return readFrame(name, os.path.join(dataDirectory, "arrow-data"), columns, start, end)
+    frame = pd.read_pickle(os.path.join(dataDirectory, "pickled-data", name + "DF.pkl"))
+    frame.index = dateIndex(frame.index)
+    if columns is not None:
+        frame = frame[[column for column in columns if column in frame.columns]]
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    return frame.loc[start:end]
+
+
+# main: converts the pickled dataframes in Data/pickled-data into the column store
+def main():
+    for name in ["cryptoPrices", "totalFollowers", "newFollowers"]:
+        writeFrame(pd.read_pickle("./Data/pickled-data/" + name + "DF.pkl"), name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# --------------------------------------------------------------------------------------------------------------
+# correlation.py:
+# Computes the correlation of every cryptocurrency with every Twitter account in a single batched step
+# (standardizing both dataframes and multiplying them), instead of one corrwith call per account
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import numpy as np
+import pandas as pd
+from transforms import toArray
+
+
+# rankColumns: replaces the values of each column by their ranks (ties get their average rank, missing values stay
+# missing), so that the Pearson correlation of the ranks is the Spearman correlation
+def rankColumns(frame):
+    return frame.rank(axis=0, method="average")
+
+
+# pearsonComplete: Pearson correlation of every column of x with every column of y (2D float arrays with the same
+# number of rows and no missing values), as a standardize-and-multiply
+def pearsonComplete(x, y):
+    x = x - x.mean(axis=0)
+    y = y - y.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = x / np.sqrt((x ** 2).sum(axis=0))
+        y = y / np.sqrt((y ** 2).sum(axis=0))
+    return x.T @ y
+
+
+# pearsonPairwise: Pearson correlation of every column of x with every column of y, where each pair of columns only
+# uses the rows in which both have a value (like DataFrame.corrwith). The sums needed for every pair are computed
+# with a handful of matrix products over the masks of present values.
+def pearsonPairwise(x, y):
+    xPresent = ~np.isnan(x)
+    yPresent = ~np.isnan(y)
+    # centering each column first keeps the sums small, which avoids losing precision for large values
+    x = np.where(xPresent, x, 0)
+    y = np.where(yPresent, y, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.where(xPresent, x - x.sum(axis=0) / xPresent.sum(axis=0), 0)
+        y = np.where(yPresent, y - y.sum(axis=0) / yPresent.sum(axis=0), 0)
+    xPresent = xPresent.astype("float64")
+    yPresent = yPresent.astype("float64")
+    count = xPresent.T @ yPresent
+    sumX = x.T @ yPresent
+    sumY = xPresent.T @ y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = x.T @ y - sumX * sumY / count
+        varianceX = (x ** 2).T @ yPresent - sumX ** 2 / count
+        varianceY = xPresent.T @ (y ** 2) - sumY ** 2 / count
+        correlation = covariance / np.sqrt(varianceX * varianceY)
+    correlation[count < 2] = np.nan
+    return np.clip(correlation, -1, 1)
+
+
+# correlationMatrix: returns the matrix of correlations between every column of assetsDF (rows of the result) and
+# every column of accountsDF (columns of the result), over the dates the two dataframes have in common. method is
+# "pearson" or "spearman". Missing values are handled pairwise, like DataFrame.corrwith (for Spearman, each column
+# is ranked over all of its values rather than only the dates where both columns have a value).
+def correlationMatrix(assetsDF, accountsDF, method="pearson"):
+    assetsDF, accountsDF = assetsDF.align(accountsDF, join="inner", axis=0)
+    if method == "spearman":
+        assetsDF, accountsDF = rankColumns(assetsDF), rankColumns(accountsDF)
+    elif method != "pearson":
+        raise ValueError("Unknown correlation method: " + method)
+    x = toArray(assetsDF)
+    y = toArray(accountsDF)
+    if np.isnan(x).any() or np.isnan(y).any():
+        correlation = pearsonPairwise(x, y)
+    else:
+        correlation = pearsonComplete(x, y)
+        if len(x) < 2:
+            correlation[:] = np.nan
+        correlation = np.clip(correlation, -1, 1)
+    return pd.DataFrame(correlation, index=assetsDF.columns, columns=accountsDF.columns)
+
+
+# averageCorrelation: mean correlation of a correlation matrix, averaged over assets for each account and then over
+# accounts (ignoring missing correlations, e.g. for accounts whose values never changed)
+def averageCorrelation(matrix):
+    return matrix.mean().mean()
+
+
+# laggedSlices: the rows of x and y that are paired when x is shifted forward by lag rows (like x.shift(lag)), i.e.
+# x[t - lag] is paired with y[t]
+def laggedSlices(rows, lag):
+    if lag >= 0:
+        return slice(0, rows - lag), slice(lag, rows)
+    return slice(-lag, rows), slice(0, rows + lag)
+
+
+# laggedCrossSums: sums of x[t - lag] * y[t] over t for every pair of columns and every lag, using FFTs. Accounts
+# are processed in blocks so that the frequency-domain products stay within about maxBytes of memory.
+def laggedCrossSums(x, y, lags, maxBytes=2 ** 28):
+    rows = len(x)
+    size = 1 << int(np.ceil(np.log2(max(2 * rows, 2))))
+    xSpectrum = np.conj(np.fft.rfft(x, n=size, axis=0))
+    blockSize = max(1, int(maxBytes // (16 * xSpectrum.shape[0] * x.shape[1])))
+    sums = np.empty((len(lags), x.shape[1], y.shape[1]))
+    for start in range(0, y.shape[1], blockSize):
+        ySpectrum = np.fft.rfft(y[:, start:start + blockSize], n=size, axis=0)
+        # (entry k of the inverse transform is the sum of x[t] * y[t + k], negative k wrap around to the end)
+        cross = np.fft.irfft(xSpectrum[:, :, None] * ySpectrum[:, None, :], n=size, axis=0)
+        sums[:, :, start:start + blockSize] = cross[[lag % size for lag in lags]]
+    return sums
+
+
+# laggedCorrelation: returns the correlations between every column of assetsDF and every column of accountsDF with
+# assetsDF shifted by each of the lags (a positive lag correlates the assets' values with the accounts' values lag
+# days later, like assetsDF.shift(lag).corrwith(...)). The result has one row per (lag, asset) and one column per
+# account; use averageByLag to average it for each lag.
+# Without missing values, the column sums for every lag come from running (cumulative) sums and the cross sums from
+# one FFT per column when there are many lags (or one matrix product per lag when there are few). With missing
+# values, each lag is computed with correlationMatrix's pairwise method.
+def laggedCorrelation(assetsDF, accountsDF, lags=range(-7, 8)):
+    assetsDF, accountsDF = assetsDF.align(accountsDF, join="inner", axis=0)
+    lags = list(lags)
+    x = toArray(assetsDF)
+    y = toArray(accountsDF)
+    rows = len(x)
+    cube = np.full((len(lags), x.shape[1], y.shape[1]), np.nan)
+    if np.isnan(x).any() or np.isnan(y).any():
+        for i, lag in enumerate(lags):
+            if abs(lag) < rows - 1:
+                xRows, yRows = laggedSlices(rows, lag)
+                cube[i] = pearsonPairwise(x[xRows], y[yRows])
+    elif rows > 0:
+        x = x - x.mean(axis=0)
+        y = y - y.mean(axis=0)
+        xSums = np.vstack([np.zeros(x.shape[1]), np.cumsum(x, axis=0)])
+        xSquares = np.vstack([np.zeros(x.shape[1]), np.cumsum(x ** 2, axis=0)])
+        ySums = np.vstack([np.zeros(y.shape[1]), np.cumsum(y, axis=0)])
+        ySquares = np.vstack([np.zeros(y.shape[1]), np.cumsum(y ** 2, axis=0)])
+        useFFT = len(lags) > 2 * np.log2(max(rows, 2))
+        crossSums = laggedCrossSums(x, y, lags) if useFFT else None
+        for i, lag in enumerate(lags):
+            count = rows - abs(lag)
+            if count < 2:
+                continue
+            xRows, yRows = laggedSlices(rows, lag)
+            sumX = xSums[xRows.stop] - xSums[xRows.start]
+            sumY = ySums[yRows.stop] - ySums[yRows.start]
+            sumXX = xSquares[xRows.stop] - xSquares[xRows.start]
+            sumYY = ySquares[yRows.stop] - ySquares[yRows.start]
+            sumXY = crossSums[i] if useFFT else x[xRows].T @ y[yRows]
+            varianceX = sumXX - sumX ** 2 / count
+            varianceY = sumYY - sumY ** 2 / count
+            # (a column that is constant over the paired rows has no correlation, but rounding in the running sums can
+            # leave it with a tiny variance instead of exactly 0)
+            varianceX[varianceX <= 1e-13 * xSquares[-1]] = np.nan
+            varianceY[varianceY <= 1e-13 * ySquares[-1]] = np.nan
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cube[i] = (sumXY - np.outer(sumX, sumY) / count) / np.sqrt(np.outer(varianceX, varianceY))
+    index = pd.MultiIndex.from_product([lags, assetsDF.columns], names=["lag", "asset"])
+    return pd.DataFrame(np.clip(cube, -1, 1).reshape(-1, y.shape[1]), index=index, columns=accountsDF.columns)
+
+
+# averageByLag: averages a result of laggedCorrelation for each lag, the same way averageCorrelation averages a
+# correlation matrix
+def averageByLag(cube):
+    return cube.groupby(level="lag").mean().mean(axis=1)
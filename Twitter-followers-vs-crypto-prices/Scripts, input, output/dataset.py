@@ -0,0 +1,206 @@
+# --------------------------------------------------------------------------------------------------------------
+# dataset.py:
+# The dataframes analyzed by matplotlib-analysis.py and the frames derived from them (rescaled, normalized, sorted,
+# split by account size, correlation matrices and their significance), as a graph of named nodes. Derived frames
+# are only computed when they are first used, and are then shared by every figure and printout until they are
+# evicted to save memory.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import sys
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from transforms import firstValid, normalize, rescale, toArray
+from correlation import averageByLag, correlationMatrix, laggedCorrelation
+import instrumentation
+from significance import testMatrix
+
+
+# frameNames: names of the dataframes collected by scraper.py
+frameNames = ["cryptoPrices", "totalFollowers", "newFollowers"]
+
+# significanceSettings: default arguments of significance.testMatrix for the significance nodes
+significanceSettings = {"method": "permutation", "resamples": 1000, "blockLength": 4, "seed": 0, "alpha": 0.05}
+
+
+# sortedByLastValue: sorts the columns of a dataframe by their last value (largest first), so that a legend of the
+# first few columns shows the largest-valued ones
+def sortedByLastValue(frame):
+    return frame.sort_values(by=[frame.index[-1]], axis=1, ascending=False)
+
+
+# bucketLabels: legend labels of the account size buckets delimited by the given numbers of followers, e.g.
+# [10 ** 6] gives "< 1,000,000" and "≥ 1,000,000"
+def bucketLabels(bounds):
+    labels = ["< " + "{:,}".format(bounds[0])] if len(bounds) > 0 else ["All"]
+    for lower, upper in zip(bounds[:-1], bounds[1:]):
+        labels.append("{:,}".format(lower) + " to " + "{:,}".format(upper))
+    if len(bounds) > 0:
+        labels.append("≥ " + "{:,}".format(bounds[-1]))
+    return labels
+
+
+# sizeBuckets: bucket number of each account (column of totalFollowersDF) by its starting number of followers, with
+# buckets delimited by the given bounds (NaN for accounts without any values)
+def sizeBuckets(totalFollowersDF, bounds):
+    starting = firstValid(toArray(totalFollowersDF))
+    buckets = np.searchsorted(np.asarray(bounds, dtype="float64"), starting, side="right").astype("float64")
+    buckets[np.isnan(starting)] = np.nan
+    return pd.Series(buckets, index=totalFollowersDF.columns)
+
+
+# sizeGroups: splits the columns of a frame of accounts by their size bucket, returning a list of (frame, label)
+# groups, one per bucket (accounts missing from the frame are left out)
+def sizeGroups(frame, buckets, bounds):
+    buckets = buckets.reindex(frame.columns)
+    return [(frame.loc[:, (buckets == bucket).values], "Accounts with " + label + " followers")
+            for bucket, label in enumerate(bucketLabels(bounds))]
+
+
+# nbytes: approximate memory used by a node's value
+def nbytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=False)))
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "__dict__"):
+        return sum(nbytes(attribute) for attribute in vars(value).values())
+    return sys.getsizeof(value)
+
+
+# Dataset: the dataframes collected by scraper.py (a dictionary of name -> dataframe) and the nodes derived from
+# them. Derived values are memoized, and the least recently used ones are evicted once they take more than
+# maxBytes. Values of shared nodes (too slow to compute again, e.g. the significance tests) are never evicted, and
+# are pickled with the dataset. sizeBounds are the numbers of starting followers delimiting the account size buckets,
+# and significance holds arguments of significance.testMatrix replacing those of significanceSettings.
+class Dataset:
+    def __init__(self, frames, sizeBounds=(10 ** 6,), maxBytes=512 * 2 ** 20, significance=None):
+        self.frames = dict(frames)
+        self.sizeBounds = list(sizeBounds)
+        self.maxBytes = maxBytes
+        self.significance = dict(significanceSettings, **(significance or {}))
+        self.nodes = {}
+        self.sharedNodes = set()
+        self.shared = {}
+        self.memo = OrderedDict()
+        self.memoBytes = 0
+        self.hits = 0
+        self.misses = 0
+        defineNodes(self)
+
+    # (only the frames, settings and values of shared nodes are pickled, e.g. to send the dataset to worker processes,
+    # which define the standard nodes again and start with an empty memo)
+    def __getstate__(self):
+        return {"frames": self.frames, "sizeBounds": self.sizeBounds, "maxBytes": self.maxBytes,
+                "significance": self.significance, "shared": self.shared}
+
+    def __setstate__(self, state):
+        self.__init__(state["frames"], state["sizeBounds"], state["maxBytes"], state["significance"])
+        self.shared = dict(state["shared"])
+
+    # define: adds a node computed by calling function with the values of the dependencies. With shared=True, its
+    # value is kept for the lifetime of the dataset and pickled with it (see computeShared).
+    def define(self, name, dependencies, function, shared=False):
+        self.nodes[name] = (list(dependencies), function)
+        if shared:
+            self.sharedNodes.add(name)
+        else:
+            self.sharedNodes.discard(name)
+
+    # dependencies: names of the nodes a node is computed from (none for the collected dataframes)
+    def dependencies(self, name):
+        if name in self.frames:
+            return []
+        if name not in self.nodes:
+            raise KeyError("Unknown dataset node: " + name)
+        return self.nodes[name][0]
+
+    # baseFrames: names of the collected dataframes a node is derived from, in order of first use
+    def baseFrames(self, name):
+        if name in self.frames:
+            return [name]
+        names = [base for dependency in self.dependencies(name) for base in self.baseFrames(dependency)]
+        return list(dict.fromkeys(names))
+
+    # computeShared: computes the shared nodes that the given nodes are derived from (or are), e.g. before the
+    # dataset is sent to worker processes, so that they aren't computed again in every worker
+    def computeShared(self, names):
+        for name in names:
+            if name in self.sharedNodes:
+                self.get(name)
+            else:
+                self.computeShared(self.dependencies(name))
+
+    # get: returns the value of a node, computing it (and its dependencies) if it isn't memoized
+    def get(self, name):
+        if name in self.frames:
+            return self.frames[name]
+        if name in self.shared:
+            self.hits += 1
+            return self.shared[name]
+        if name in self.memo:
+            self.hits += 1
+            self.memo.move_to_end(name)
+            return self.memo[name][0]
+        if name not in self.nodes:
+            raise KeyError("Unknown dataset node: " + name)
+        self.misses += 1
+        dependencies, function = self.nodes[name]
+        arguments = [self.get(dependency) for dependency in dependencies]
+        with instrumentation.stage("analysis.compute", node=name) as record:
+            value = function(*arguments)
+            record.rows = instrumentation.rowCount(value)
+        if name in self.sharedNodes:
+            self.shared[name] = value
+            return value
+        size = nbytes(value)
+        self.memo[name] = (value, size)
+        self.memoBytes += size
+        self.evict()
+        return value
+
+    # evict: removes the least recently used values until the memoized values fit in maxBytes (the most recently
+    # computed value is always kept)
+    def evict(self):
+        while self.memoBytes > self.maxBytes and len(self.memo) > 1:
+            self.memoBytes -= self.memo.popitem(last=False)[1][1]
+
+    # dates: the dates of the collected dataframe a node is derived from
+    def dates(self, name):
+        return self.frames[self.baseFrames(name)[0]].index
+
+    # report: one-line summary of memo usage
+    def report(self):
+        return ("Dataset: " + str(self.hits) + " hits, " + str(self.misses) + " misses, " + str(len(self.memo)) +
+                " frames memoized (" + "{:.1f}".format(self.memoBytes / 2 ** 20) + " MB)")
+
+
+# defineNodes: defines the nodes derived from the collected dataframes, named after how they are computed, e.g.
+# "rescale(totalFollowers)", "sortByLast(rescale(totalFollowers))", "sizeGroups(normalize(newFollowers))" or
+# "correlation(cryptoPrices, newFollowers)" or "significance(cryptoPrices, newFollowers)"
+def defineNodes(dataset):
+    bounds = dataset.sizeBounds
+    settings = dataset.significance
+    dataset.define("sizeBuckets", ["totalFollowers"], lambda totalFollowersDF: sizeBuckets(totalFollowersDF, bounds))
+    for base in frameNames:
+        for name, transform in [("rescale", rescale), ("normalize", normalize)]:
+            dataset.define(name + "(" + base + ")", [base], transform)
+        for frame in [base, "rescale(" + base + ")", "normalize(" + base + ")"]:
+            dataset.define("sortByLast(" + frame + ")", [frame], sortedByLastValue)
+    for base in ["totalFollowers", "newFollowers"]:
+        for frame in [base, "rescale(" + base + ")", "normalize(" + base + ")"]:
+            dataset.define("sizeGroups(" + frame + ")", [frame, "sizeBuckets"],
+                           lambda frameDF, buckets: sizeGroups(frameDF, buckets, bounds))
+        pair = "(cryptoPrices, " + base + ")"
+        dataset.define("correlation" + pair, ["cryptoPrices", base], correlationMatrix)
+        dataset.define("laggedCorrelation" + pair, ["cryptoPrices", base],
+                       lambda prices, followers: laggedCorrelation(prices, followers, range(-7, 8)))
+        dataset.define("averageByLag" + pair, ["laggedCorrelation" + pair], averageByLag)
+        dataset.define("significance" + pair, ["cryptoPrices", base],
+                       lambda prices, followers: testMatrix(prices, followers, **settings), shared=True)
@@ -0,0 +1,148 @@
+# --------------------------------------------------------------------------------------------------------------
+# driverpool.py:
+# Keeps a pool of long-lived headless Chrome sessions that scraper.py borrows and returns, so that a browser
+# is started once per session instead of once per webpage
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+import instrumentation
+
+
+# newHeadlessDriver: starts a headless Chrome session
+def newHeadlessDriver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+# PooledDriver: a browser session together with the number of pages it has loaded so far
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pagesLoaded = 0
+
+
+# DriverPool: a fixed number of browser sessions shared between threads. Sessions are started lazily, returned to
+# the pool after each page, and recycled (closed and replaced) after maxPages pages or after a crash. A condition
+# guards the idle sessions and the number started, so that a thread waiting for a session wakes up when one is
+# returned or when a slot is freed by a discarded session.
+class DriverPool:
+    def __init__(self, size=4, maxPages=25, driverFactory=newHeadlessDriver):
+        if size < 1:
+            raise ValueError("DriverPool size must be at least 1")
+        self.size = size
+        self.maxPages = maxPages
+        self.driverFactory = driverFactory
+        self.idle = []
+        self.started = 0
+        self.available = threading.Condition()
+        self.closed = False
+
+    # acquire: takes an idle session (the most recently used one), starting a new one if fewer than size sessions
+    # exist, otherwise waits until a session is returned or a slot is freed
+    def acquire(self):
+        with self.available:
+            while True:
+                if self.closed:
+                    raise RuntimeError("DriverPool is closed")
+                if len(self.idle) > 0:
+                    return self.idle.pop()
+                if self.started < self.size:
+                    self.started += 1
+                    break
+                self.available.wait()
+        try:
+            with instrumentation.stage("scrape.launch"):
+                return PooledDriver(self.driverFactory())
+        except Exception:
+            self.freeSlot()
+            raise
+
+    # release: returns a session to the pool, or recycles it if it crashed or has reached its page limit
+    def release(self, pooled, crashed=False):
+        if crashed or self.closed or (self.maxPages and pooled.pagesLoaded >= self.maxPages):
+            self.discard(pooled)
+            return
+        with self.available:
+            self.idle.append(pooled)
+            self.available.notify()
+
+    # discard: quits a session and frees its slot so that the next acquire starts a fresh one
+    def discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        self.freeSlot()
+
+    # freeSlot: frees the slot of a session that was quit or failed to start, waking a thread waiting for one
+    def freeSlot(self):
+        with self.available:
+            self.started -= 1
+            self.available.notify()
+
+    # session: context manager for borrowing a browser session, e.g. "with pool.session() as driver:"
+    @contextmanager
+    def session(self):
+        pooled = self.acquire()
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            self.release(pooled, crashed=True)
+            raise
+        except BaseException:
+            self.release(pooled)
+            raise
+        pooled.pagesLoaded += 1
+        self.release(pooled)
+
+    # fetch: loads a webpage in a pooled session and returns its html. A crashed session is recycled and the page
+    # is retried once in a fresh session.
+    def fetch(self, URL, retries=1):
+        for attempt in range(retries + 1):
+            try:
+                with self.session() as driver, instrumentation.stage("scrape.load", URL=URL) as record:
+                    driver.get(URL)
+                    html = driver.page_source
+                    record.bytes = instrumentation.textBytes(html)
+                    return html
+            except WebDriverException:
+                if attempt == retries:
+                    raise
+
+    # map: applies function to every item in parallel, using one thread per browser session. Results are returned
+    # in the same order as items.
+    def map(self, function, items):
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(function, items))
+
+    # fetchAll: fetches every URL in parallel across the pool and returns a dictionary of URL -> html
+    def fetchAll(self, URLs):
+        URLs = list(dict.fromkeys(URLs))
+        return dict(zip(URLs, self.map(self.fetch, URLs)))
+
+    # close: quits every idle session and wakes the threads waiting for one (their acquire raises a RuntimeError);
+    # sessions still in use are quit when they are returned
+    def close(self):
+        with self.available:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.available.notify_all()
+        for pooled in idle:
+            self.discard(pooled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
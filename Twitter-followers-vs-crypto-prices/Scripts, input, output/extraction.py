@@ -0,0 +1,117 @@
+# --------------------------------------------------------------------------------------------------------------
+# extraction.py:
+# Extracts dates, follower counts and prices from the html of SocialBlade and investing.com pages for scraper.py.
+# Only the elements holding the data are parsed, and values are returned as typed numpy arrays.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import re
+import numpy as np
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    import lxml.html
+except ImportError:  # lxml is optional, BeautifulSoup's built-in parser is used without it
+    lxml = None
+
+
+# inline styles of the SocialBlade table cells holding the dates, the total followers (every second 120px cell,
+# the others hold the following count) and the daily change in followers
+datesStyle = "width: 80px; float: left;"
+totalsStyle = "width: 120px; float: left;"
+changesStyle = "width: 100px; float: left;"
+
+# number of days in a SocialBlade monthly table, not counting the first day and the current "live" day
+days = 28
+
+
+# elementTexts: returns the text of every `tag` element whose style attribute is one of `styles` (or of every
+# `tag` element if styles is None), grouped by style and in document order. Uses lxml if it is installed,
+# otherwise BeautifulSoup with a strainer so that only the matching elements are built into a tree.
+def elementTexts(html, tag, styles=None, backend="auto"):
+    if backend == "auto":
+        backend = "html.parser" if lxml is None else "lxml"
+    texts = {style: [] for style in styles} if styles is not None else {None: []}
+    if backend == "lxml":
+        for element in lxml.html.fromstring(html).iter(tag):
+            style = element.get("style") if styles is not None else None
+            if style in texts:
+                texts[style].append(element.text_content())
+    elif backend == "html.parser":
+        strainer = SoupStrainer(tag, style=list(styles)) if styles is not None else SoupStrainer(tag)
+        for element in BeautifulSoup(html, "html.parser", parse_only=strainer).find_all(tag):
+            texts[element.get("style") if styles is not None else None].append(element.get_text())
+    else:
+        raise ValueError("Unknown parser backend: " + backend)
+    return texts
+
+
+# numberPattern: displayed numbers, e.g. "1,234", "+56", "-7" or "0.000123" ("-" alone, meaning no change, and
+# empty cells are read as 0)
+numberPattern = re.compile(r"[+-]?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?")
+
+
+# toNumbers: converts displayed numbers such as "1,234", "+56" or "-" (no change) into a numpy array. Raises a
+# ValueError listing the cells that aren't numbers (e.g. if the page changed its layout), or whose values don't fit
+# in dtype, instead of storing them as wrong values.
+def toNumbers(texts, dtype):
+    texts = np.char.strip(np.array(texts, dtype=str))
+    texts[(texts == "-") | (texts == "")] = "0"
+    invalid = [str(text) for text in texts if numberPattern.fullmatch(text) is None]
+    if len(invalid) == 0:
+        texts = np.char.replace(np.char.replace(texts, ",", ""), "+", "")
+        if np.issubdtype(dtype, np.integer):
+            invalid = [str(text) for text in texts if "." in text or abs(int(text)) > np.iinfo(dtype).max]
+    if len(invalid) > 0:
+        raise ValueError("Expected " + np.dtype(dtype).name + " numbers but found " +
+                         ", ".join("'" + text + "'" for text in invalid[:5]) +
+                         (" and " + str(len(invalid) - 5) + " more" if len(invalid) > 5 else ""))
+    return texts.astype(dtype)
+
+
+# checkValues: raises an error if any of the values extracted from a page is outside the range of valid values
+def checkValues(values, description, minimum=None, positive=False):
+    invalid = ~np.isfinite(values) if np.issubdtype(values.dtype, np.floating) else np.zeros(len(values), dtype=bool)
+    if positive:
+        invalid |= values <= 0
+    if minimum is not None:
+        invalid |= values < minimum
+    if invalid.any():
+        raise ValueError("Found invalid " + description + ": " + ", ".join(map(str, values[invalid][:5])))
+
+
+# checkCount: raises an error if a page has fewer cells than expected, e.g. if it was blocked or has changed layout
+def checkCount(texts, count, description):
+    if len(texts) < count:
+        raise ValueError("Expected at least " + str(count) + " " + description + " but found " + str(len(texts)))
+
+
+# extractDates: retrieves the dates listed on a SocialBlade page as a datetime64 array, without the first day (which
+# has no new followers recorded) and the current day (which holds the "live" follower count)
+def extractDates(html, backend="auto"):
+    texts = elementTexts(html, "div", [datesStyle], backend)[datesStyle]
+    checkCount(texts, 3, "dates")
+    return np.array([text.strip() for text in texts[1:-1]], dtype="datetime64[D]")
+
+
+# extractFollowers: retrieves total and new follower counts for each day on a SocialBlade page as int64 arrays
+def extractFollowers(html, backend="auto"):
+    texts = elementTexts(html, "div", [totalsStyle, changesStyle], backend)
+    checkCount(texts[totalsStyle], 2 * (days + 1), "follower count cells")
+    checkCount(texts[changesStyle], days + 1, "follower change cells")
+    totalFollowers = toNumbers(texts[totalsStyle][3:2 * days + 3:2], np.int64)
+    newFollowers = toNumbers(texts[changesStyle][1:days + 1], np.int64)
+    checkValues(totalFollowers, "follower counts", minimum=0)
+    return totalFollowers, newFollowers
+
+
+# extractPrices: retrieves the daily closing prices on an investing.com page as a float64 array, from oldest to
+# newest (the page lists them from newest to oldest in the second column of a 7-column table, after 2 other rows)
+def extractPrices(html, backend="auto"):
+    texts = elementTexts(html, "td", None, backend)[None]
+    checkCount(texts, 16 + 7 * (days - 1), "table cells")
+    prices = toNumbers(texts[15:16 + 7 * (days - 1):7][::-1], np.float64)
+    checkValues(prices, "prices", positive=True)
+    return prices
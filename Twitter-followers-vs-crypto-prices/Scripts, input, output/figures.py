@@ -0,0 +1,407 @@
+# --------------------------------------------------------------------------------------------------------------
+# figures.py:
+# Registry of the figures generated by matplotlib-analysis.py. Each figure is declared as a spec (the frames of the
+# dataset.Dataset it uses, how they're transformed, the kind of plot, its title, labels and ticks), and the specs are
+# drawn in parallel in a pool of processes, each figure on its own Figure object rendered with the non-interactive Agg
+# backend
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import fnmatch
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mpc
+import buildcache
+import heatmaps
+import instrumentation
+import linerender
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# FigureSpec: declaration of one figure. inputs are the names of the dataset nodes drawn by the renderer of the given
+# kind (the value of the node if there is one input, a tuple of values otherwise), after applying transform to them
+# if it isn't None. title (also the name of the image file), xlabel and ylabel can contain
+# {start} and {end}, which are replaced by the first and last date of the first input. ticks is "dates" (a major
+# tick every 7 days and a minor tick every day), "labels" (one tick per row and column of a matrix) or "index" (one
+# tick per value of the index of a series). options holds settings specific to the kind of plot.
+class FigureSpec:
+    def __init__(self, name, title, inputs, kind, transform=None, xlabel=None, ylabel=None, ticks="dates", yticks=None,
+                 options=None):
+        self.name = name
+        self.title = title
+        self.inputs = inputs
+        self.transform = transform
+        self.kind = kind
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.ticks = ticks
+        self.yticks = yticks
+        self.options = options if options is not None else {}
+
+    # format: fills in the dates of the first input in a title or label
+    def format(self, text, dataset):
+        if text is None:
+            return None
+        dates = pd.to_datetime(pd.Index(dataset.dates(self.inputs[0])))
+        if len(dates) == 0:
+            return text.format(start="?", end="?")
+        return text.format(start=dates[0].strftime("%Y-%m-%d"), end=dates[-1].strftime("%Y-%m-%d"))
+
+    # fileName: name of the image file of the figure
+    def fileName(self, dataset):
+        return self.format(self.title, dataset) + ".png"
+
+    # data: the values drawn by the figure
+    def data(self, dataset):
+        values = [dataset.get(name) for name in self.inputs]
+        if self.transform is not None:
+            return self.transform(*values)
+        return values[0] if len(values) == 1 else tuple(values)
+
+
+# dateTicks: puts a major tick every 7 days from the first date and a minor tick on every date, and returns the
+# label describing the range of dates, e.g. "Date (from Aug. 15 to Sep. 11)"
+def dateTicks(ax, index):
+    if len(index) == 0:
+        return "Date"
+    dates = pd.to_datetime(pd.Index(index))
+    ax.set_xticks(pd.date_range(dates[0], dates[-1], freq="7D"))
+    ax.set_xticks(index, minor=True)
+    return "Date (from " + dates[0].strftime("%b. ") + str(dates[0].day) + " to " + \
+        dates[-1].strftime("%b. ") + str(dates[-1].day) + ")"
+
+
+# setLabels: sets the title, axis labels and ticks shared by the kinds of plot drawn over dates
+def setLabels(ax, spec, dataset, index):
+    ax.set_title(spec.format(spec.title, dataset))
+    xlabel = dateTicks(ax, index) if spec.ticks == "dates" else None
+    ax.set_xlabel(spec.format(spec.xlabel, dataset) or xlabel)
+    ax.set_ylabel(spec.format(spec.ylabel, dataset))
+
+
+# drawLines: one line per column of a dataframe (drawn by linerender.plotFrame in lineMode). options: legend (number
+# of columns shown in the legend, all if "all", no legend if None; in the quantile bands mode, the bands are shown)
+def drawLines(fig, ax, data, spec, dataset, dpi, lineMode):
+    handles = linerender.plotFrame(ax, data, lineMode, dpi)
+    legend = spec.options.get("legend")
+    if linerender.chooseMode(len(data.columns), lineMode) == "bands":
+        ax.legend(handles=handles)
+    elif legend is not None:
+        count = len(data.columns) if legend == "all" else legend
+        ax.legend(handles[:count], data.columns[:count])
+    setLabels(ax, spec, dataset, data.index)
+
+
+# drawTwinLines: two dataframes (left, right) on the same dates, each on its own y axis. options: colors, alphas,
+# labels (legend of each axis), limits (factors scaling each axis' limits as lower = 1 - factor * top and
+# upper = 1 + factor * top) and rightLabel (label of the right axis)
+def drawTwinLines(fig, ax, data, spec, dataset, dpi, lineMode):
+    left, right = data
+    colors, alphas, labels, limits = (spec.options[key] for key in ["colors", "alphas", "labels", "limits"])
+    handles = linerender.plotFrame(ax, left, lineMode, dpi, colors[0], alphas[0])
+    ax.set_title(spec.format(spec.title, dataset))
+    ax.set_ylabel(spec.format(spec.ylabel, dataset))
+    ax.set_ylim(1 - limits[0][0] * max(ax.get_ylim()), 1 + limits[0][1] * max(ax.get_ylim()))
+    ax.legend(handles[:1], [labels[0]], loc=2)
+    ax2 = ax.twinx()
+    handles = linerender.plotFrame(ax2, right, lineMode, dpi, colors[1], alphas[1])
+    ax.set_xlabel(spec.format(spec.xlabel, dataset) or dateTicks(ax2, right.index))
+    ax2.set_ylabel(spec.format(spec.options["rightLabel"], dataset))
+    ax2.set_ylim(1 - limits[1][0] * max(ax2.get_ylim()), 1 + limits[1][1] * max(ax2.get_ylim()))
+    ax2.legend(handles[:1], [labels[1]], loc=1)
+
+
+# drawGroups: groups of lines (a list of (frame, label)), each group in the color and alpha of groupStyles with one
+# legend entry (or one per band in the quantile bands mode). Empty groups are left out of the legend.
+def drawGroups(fig, ax, data, spec, dataset, dpi, lineMode):
+    handles = []
+    for (frame, label), (color, alpha) in zip(data, groupStyles):
+        groupHandles = linerender.plotFrame(ax, frame, lineMode, dpi, color, alpha, label)
+        bands = linerender.chooseMode(len(frame.columns), lineMode) == "bands"
+        handles += groupHandles if bands else groupHandles[:1]
+    ax.legend(handles=handles, loc=9, framealpha=0.9)
+    setLabels(ax, spec, dataset, data[0][0].index)
+
+
+# drawMatrix: a correlation matrix, with its rows and columns labelled, or a (matrix, significance.SignificanceResult)
+# pair, marking the significant correlations. Small matrices are drawn with matshow and significant correlations
+# marked with a dot; larger ones are drawn by heatmaps.py as an image, fading the other correlations, or as an
+# overview (in the "pages" mode, or with heatmaps.drawPages, also returning one page-drawing function per page of
+# accounts, see renderFigure).
+# options: cmap (colormap, the default one if not given), colorbar (ticks of the colorbar), cluster (reorder rows and
+# columns by hierarchical clustering) and heatmap (mode of heatmaps.chooseMode, "auto" by default)
+def drawMatrix(fig, ax, data, spec, dataset, dpi, lineMode):
+    data, significance = data if isinstance(data, tuple) else (data, None)
+    if spec.options.get("cluster"):
+        data = heatmaps.clusterMatrix(data)
+    significant = None
+    if significance is not None:
+        significant = significance.significant.reindex(index=data.index, columns=data.columns,
+                                                       fill_value=False).to_numpy()
+    cmap, ticks = spec.options.get("cmap"), spec.options["colorbar"]
+    mode = heatmaps.chooseMode(len(data.columns), spec.options.get("heatmap", "auto"))
+    title = spec.format(spec.title, dataset)
+    ax.set_title(title)
+    if mode in ["overview", "pages"]:
+        colorbar = heatmaps.drawOverview(fig, ax, data, cmap, ticks, significant, withPages=mode == "pages")
+    elif mode == "image":
+        colorbar = heatmaps.drawImage(fig, ax, data, cmap, ticks, significant)
+    else:
+        cax = ax.matshow(data, vmin=-1, vmax=1, cmap=cmap)
+        ax.set_xticks(range(len(data.columns)))
+        ax.set_xticklabels(data.columns, rotation=90)
+        ax.set_yticks(range(len(data.index)))
+        ax.set_yticklabels(data.index)
+        ax.tick_params(axis='both', which='major', labelsize=5)
+        colorbar = fig.colorbar(cax, ax=ax, ticks=ticks, orientation="horizontal")
+        if significant is not None:
+            rows, columns = np.nonzero(significant)
+            ax.scatter(columns, rows, s=4, c="k", marker="o", linewidths=0)
+    if significance is not None:
+        marking = "• significant correlations" if mode == "labels" else "unfaded: significant correlations"
+        colorbar.set_label(marking + " (" + significance.describe() + ")", fontsize=8)
+    if mode != "pages":
+        return None
+
+    # (one function drawing each page of accounts on its own figure)
+    def drawPage(start, stop, number, count):
+        def draw(pageFig, pageAx):
+            pageAx.set_title(title + " - page " + str(number) + " of " + str(count), pad=40)
+            pageColorbar = heatmaps.drawImage(pageFig, pageAx, data.iloc[:, start:stop], cmap, ticks,
+                                              significant[:, start:stop] if significant is not None else None,
+                                              maxLabels=heatmaps.pageColumns, labelsize=3)
+            pageColorbar.set_label(colorbar.ax.get_xlabel(), fontsize=8)
+        return draw
+
+    ranges = heatmaps.pages(len(data.columns))
+    return [drawPage(start, stop, number + 1, len(ranges)) for number, (start, stop) in enumerate(ranges)]
+
+
+# drawBars: one bar per value of a series, labelled by its index
+def drawBars(fig, ax, data, spec, dataset, dpi, lineMode):
+    ax.bar(data.index, data.values)
+    setLabels(ax, spec, dataset, data.index)
+    ax.set_xticks(data.index)
+    if spec.yticks is not None:
+        ax.set_yticks(spec.yticks)
+
+
+# groupStyles: color and alpha of each group drawn by drawGroups (e.g. account size buckets, from smallest to largest)
+groupStyles = [("r", 0.5), ("b", 0.75), ("g", 0.75), ("m", 0.75), ("c", 0.75), ("y", 0.75)]
+
+# renderers: the function drawing each kind of plot
+renderers = {"lines": drawLines, "twinLines": drawTwinLines, "groups": drawGroups, "matrix": drawMatrix,
+             "bars": drawBars}
+
+# stratifiedCmap: a custom colormap for the correlation matrix plot that divides the correlations more sharply
+stratifiedCmap = mpc.LinearSegmentedColormap("", {'red': [(0, 0, 64 / 255),
+                                                          (0.125, 64 / 255, 70 / 255),
+                                                          (0.875, 70 / 255, 249 / 255),
+                                                          (1, 249 / 255, 0)],
+                                                  'green': [(0, 0, 17 / 255),
+                                                            (0.125, 17 / 255, 142 / 255),
+                                                            (0.875, 142 / 255, 232 / 255),
+                                                            (1, 232 / 255, 0)],
+                                                  'blue': [(0, 0, 81 / 255),
+                                                           (0.125, 81 / 255, 140 / 255),
+                                                           (0.875, 140 / 255, 85 / 255),
+                                                           (1, 85 / 255, 0)]})
+
+# registry: every figure generated by matplotlib-analysis.py, by name, in the order they are generated
+registry = {spec.name: spec for spec in [
+    FigureSpec("totalFollowers", "Total Twitter followers by username", ["sortByLast(totalFollowers)"], "lines",
+               ylabel="Total followers", options={"legend": 5}),
+    FigureSpec("newFollowers", "Daily new Twitter followers by username", ["sortByLast(newFollowers)"], "lines",
+               ylabel="New followers", options={"legend": 5}),
+    FigureSpec("relativeTotalFollowers", "Total followers relative to followers on {start}",
+               ["sortByLast(rescale(totalFollowers))"], "lines",
+               ylabel="Ratio of total followers to total followers on {start}", options={"legend": 5}),
+    FigureSpec("relativeNewFollowers", "Daily new followers relative to new followers on {start}",
+               ["sortByLast(rescale(newFollowers))"], "lines",
+               ylabel="Ratio of new followers to new followers on {start}", options={"legend": 5}),
+    FigureSpec("relativeCryptoPrices", "Cryptocurrency prices relative to price on {start}",
+               ["rescale(cryptoPrices)"], "lines", ylabel="Ratio of price to price on {start}",
+               options={"legend": "all"}),
+    FigureSpec("followersVsPrices", "Change in total followers vs change in crypto prices",
+               ["rescale(totalFollowers)", "rescale(cryptoPrices)"], "twinLines",
+               ylabel="Ratio of total followers to total followers on {start}",
+               options={"colors": ["r", "b"], "alphas": [0.5, 0.75],
+                        "labels": ["Total followers", "Cryptocurrency prices"], "limits": [(0.006, 0.06), (0.1, 1)],
+                        "rightLabel": "Ratio of price to price on {start}"}),
+    FigureSpec("normalizedTotalFollowers", "Normalized graph of total followers for each user",
+               ["normalize(totalFollowers)"], "lines", ylabel="0 represents minimum and 1 represents maximum"),
+    FigureSpec("normalizedNewFollowers", "Normalized graph of daily new followers for each user",
+               ["normalize(newFollowers)"], "lines", ylabel="0 represents minimum and 1 represents maximum"),
+    FigureSpec("normalizedCryptoPrices", "Normalized graph of cryptocurrency prices", ["normalize(cryptoPrices)"],
+               "lines", ylabel="0 represents minimum and 1 represents maximum", options={"legend": "all"}),
+    FigureSpec("totalFollowersMatrix", "Correlation matrix - total followers vs crypto prices",
+               ["correlation(cryptoPrices, totalFollowers)"], "matrix", ticks="labels",
+               options={"colorbar": [-1, -0.5, 0, 0.5, 1]}),
+    FigureSpec("stratifiedTotalFollowersMatrix", "Correlation matrix - total followers vs crypto prices (stratified)",
+               ["correlation(cryptoPrices, totalFollowers)"], "matrix", ticks="labels",
+               options={"colorbar": [-1, -0.75, 0, 0.75, 1], "cmap": stratifiedCmap}),
+    FigureSpec("newFollowersMatrix", "Correlation matrix - daily new followers vs crypto prices",
+               ["correlation(cryptoPrices, newFollowers)"], "matrix", ticks="labels",
+               options={"colorbar": [-1, -0.5, 0, 0.5, 1]}),
+    FigureSpec("clusteredTotalFollowersMatrix",
+               "Correlation matrix - total followers vs crypto prices (clustered)",
+               ["correlation(cryptoPrices, totalFollowers)"], "matrix", ticks="labels",
+               options={"colorbar": [-1, -0.5, 0, 0.5, 1], "cluster": True}),
+    FigureSpec("clusteredNewFollowersMatrix",
+               "Correlation matrix - daily new followers vs crypto prices (clustered)",
+               ["correlation(cryptoPrices, newFollowers)"], "matrix", ticks="labels",
+               options={"colorbar": [-1, -0.5, 0, 0.5, 1], "cluster": True}),
+    FigureSpec("totalFollowersSignificance",
+               "Correlation matrix - total followers vs crypto prices (significant correlations marked)",
+               ["correlation(cryptoPrices, totalFollowers)", "significance(cryptoPrices, totalFollowers)"], "matrix",
+               ticks="labels", options={"colorbar": [-1, -0.5, 0, 0.5, 1]}),
+    FigureSpec("newFollowersSignificance",
+               "Correlation matrix - daily new followers vs crypto prices (significant correlations marked)",
+               ["correlation(cryptoPrices, newFollowers)", "significance(cryptoPrices, newFollowers)"], "matrix",
+               ticks="labels", options={"colorbar": [-1, -0.5, 0, 0.5, 1]}),
+    FigureSpec("totalFollowersLags", "Correlation between crypto prices and total followers shifted by date",
+               ["averageByLag(cryptoPrices, totalFollowers)"], "bars",
+               xlabel="Days crypto prices behind total followers", ylabel="Average correlation", ticks="index",
+               yticks=[x / 4 for x in range(-4, 5)]),
+    FigureSpec("newFollowersLags", "Correlation between crypto prices and daily new followers shifted by date",
+               ["averageByLag(cryptoPrices, newFollowers)"], "bars",
+               xlabel="Days crypto prices behind new followers", ylabel="Average correlation", ticks="index",
+               yticks=[x / 4 for x in range(-4, 5)]),
+    FigureSpec("relativeTotalFollowersBySize",
+               "Total followers relative to followers on {start} - small accounts vs large accounts",
+               ["sizeGroups(rescale(totalFollowers))"], "groups",
+               ylabel="Ratio of total followers to total followers on {start}"),
+    FigureSpec("relativeNewFollowersBySize",
+               "Daily new followers relative to new followers on {start} - small accounts vs large accounts",
+               ["sizeGroups(rescale(newFollowers))"], "groups",
+               ylabel="Ratio of new followers to new followers on {start}"),
+    FigureSpec("normalizedTotalFollowersBySize",
+               "Normalized graph of total followers - small accounts vs large accounts",
+               ["sizeGroups(normalize(totalFollowers))"], "groups",
+               ylabel="0 represents minimum and 1 represents maximum"),
+    FigureSpec("normalizedNewFollowersBySize",
+               "Normalized graph of daily new followers - small accounts vs large accounts",
+               ["sizeGroups(normalize(newFollowers))"], "groups",
+               ylabel="0 represents minimum and 1 represents maximum"),
+]}
+
+
+# selectFigures: returns the names of the registered figures matching any of the patterns (names, or shell-style
+# wildcards such as "*Matrix"), in registry order. All figures are selected if patterns is None.
+def selectFigures(patterns=None):
+    if patterns is None:
+        return list(registry)
+    for pattern in patterns:
+        if len(fnmatch.filter(registry, pattern)) == 0:
+            raise ValueError("No figure matches " + pattern + " (see --list for the figure names)")
+    return [name for name in registry if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+
+# newFigure: a new Figure object (independent of pyplot's global state) with the size of the saved images and one
+# axes. Returns the figure and its axes.
+def newFigure():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    fig.set_size_inches(12, 6.75)
+    ax = fig.subplots()
+    ax.tick_params(length=5)
+    return fig, ax
+
+
+# savePages: draws each of the page-drawing functions returned by a renderer (taking a figure and its axes) on a new
+# figure, saved next to the image of the figure as "<image> - page N.png", and removes the pages of earlier runs.
+# Returns the paths of the pages.
+def savePages(pages, path, dpi):
+    stem = os.path.splitext(path)[0]
+    for previous in glob.glob(glob.escape(stem) + " - page *.png"):
+        os.remove(previous)
+    pagePaths = []
+    for number, draw in enumerate(pages):
+        fig, ax = newFigure()
+        draw(fig, ax)
+        pagePaths.append(stem + " - page " + str(number + 1) + ".png")
+        fig.savefig(pagePaths[-1], dpi=dpi)
+    return pagePaths
+
+
+# renderFigure: draws one figure on a new Figure object and saves it as an image in the directory (with the pages
+# drawn by its renderer, if it returns any, see savePages). lineMode is how the columns of line plots are drawn (see
+# linerender.chooseMode). Returns the paths of the files saved: the image, then its pages.
+def renderFigure(spec, dataset, directory="./Figures", dpi=200, lineMode="auto"):
+    with instrumentation.stage("analysis.render", figure=spec.name) as record:
+        fig, ax = newFigure()
+        pages = renderers[spec.kind](fig, ax, spec.data(dataset), spec, dataset, dpi, lineMode)
+        path = os.path.join(directory, spec.fileName(dataset))
+        fig.savefig(path, dpi=dpi)
+        paths = [path] + savePages(pages or [], path, dpi)
+        record.bytes = sum(os.path.getsize(saved) for saved in paths)
+    return paths
+
+
+# workerDataset: the dataset of a worker process, set once per worker by initWorker so that its dataframes aren't
+# pickled again for every figure. Derived frames are memoized in each worker.
+workerDataset = None
+
+
+# initWorker: stores the dataset in a worker process, profiles and traces the same stages as the main process (with
+# the settings of its instrumentation.Recorder), and draws matrices with the same heatmaps.py settings
+def initWorker(dataset, instrumentationSettings, heatmapSettings):
+    global workerDataset
+    workerDataset = dataset
+    instrumentation.configure(**instrumentationSettings)
+    heatmaps.configure(**heatmapSettings)
+
+
+# renderInWorker: renders a registered figure in a worker process. Returns the paths of the files saved and the
+# instrumentation records of the stages run in the worker, which are logged by the main process.
+def renderInWorker(name, directory, dpi, lineMode):
+    paths = renderFigure(registry[name], workerDataset, directory, dpi, lineMode)
+    return paths, instrumentation.recorder.drain()
+
+
+# renderFigures: renders the named figures (all if None) of a dataset.Dataset in a pool of processes (the number of
+# CPUs if processes is None, or in this process, sharing the dataset's memoized frames, if processes is 1). The
+# dataset's shared nodes are computed in this process and sent to the workers.
+# With a buildcache.BuildCache, figures whose data and spec haven't changed since they were last drawn are skipped,
+# and the images of figures that are no longer in the registry are removed.
+# lineMode is how the columns of line plots are drawn (see linerender.chooseMode).
+# Returns the paths of the files saved for each figure drawn (see renderFigure), in the order of names.
+def renderFigures(dataset, names=None, processes=None, directory="./Figures", dpi=200, cache=None,
+                  lineMode="auto"):
+    names = list(registry) if names is None else names
+    os.makedirs(directory, exist_ok=True)
+    if cache is not None:
+        specs = [registry[name] for name in names]
+        with instrumentation.stage("analysis.fingerprint", figures=len(specs)):
+            fingerprints = buildcache.fingerprints(dataset, specs, renderers, dpi, lineMode,
+                                                   {"matrix": heatmaps.settings()})
+        names = [name for name in names if not cache.isCurrent(name, fingerprints[name])]
+    processes = min(processes or os.cpu_count() or 1, len(names))
+    if processes <= 1:
+        paths = [renderFigure(registry[name], dataset, directory, dpi, lineMode) for name in names]
+    else:
+        # (the shared nodes, e.g. the significance tests, are computed once here and sent to the workers with the
+        # dataset, which also keeps them for the printouts of matplotlib-analysis.py)
+        dataset.computeShared([name for figure in names for name in registry[figure].inputs])
+        with ProcessPoolExecutor(processes, initializer=initWorker,
+                                 initargs=(dataset, instrumentation.recorder.settings(),
+                                           heatmaps.settings())) as executor:
+            futures = [executor.submit(renderInWorker, name, directory, dpi, lineMode) for name in names]
+            paths = []
+            for future in futures:
+                figurePaths, records = future.result()
+                paths.append(figurePaths)
+                instrumentation.recorder.extend(records)
+    if cache is not None:
+        for name, figurePaths in zip(names, paths):
+            cache.record(name, [os.path.basename(path) for path in figurePaths], fingerprints[name])
+        cache.removeOrphans(registry)
+        cache.save()
+    return paths
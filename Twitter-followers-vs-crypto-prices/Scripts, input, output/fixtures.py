@@ -0,0 +1,114 @@
+# --------------------------------------------------------------------------------------------------------------
+# fixtures.py:
+# Builds SocialBlade and investing.com pages in the layout read by scraper.py, and saves fixture pages rebuilt from
+# the collected data in Data/ for benchmark.py. The pages are synthetic: they are not saved from the websites, their
+# markup only reproduces the elements and positions the parsing code reads (padded with unrelated filler), and they
+# were written to fit that code. Benchmarks and checks on them therefore can't detect a change of the websites'
+# layout; pages saved from the websites can replace them under the same file names in Benchmarks/Fixtures.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import datetime as dt
+import os
+import numpy as np
+import pandas as pd
+
+
+# unrelated markup repeated around the tables, so that pages have roughly the size and structure of the real ones
+filler = ('<div class="nav-item" style="width: 150px; float: left;"><a href="/page">Link</a></div>\n'
+          '<div class="ad-slot"><script>window.ads = window.ads || []; ads.push({});</script></div>\n'
+          '<p class="text">Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p>\n')
+
+
+# formatNumber: formats a number the way the websites display it, e.g. 24302.8 -> "24,302.8"
+def formatNumber(value):
+    text = np.format_float_positional(value, trim="-")
+    integer, _, decimals = text.partition(".")
+    return "{:,}".format(int(integer)) + ("." + decimals if decimals else "")
+
+
+# formatChange: formats a daily change in followers the way SocialBlade displays it, e.g. 335 -> "+335"
+def formatChange(value):
+    if value == 0:
+        return '<span style="color:#555;">-</span>'
+    if value > 0:
+        return '<span style="color:#41a200;">+' + "{:,}".format(value) + '</span>'
+    return '<span style="color:#e53935;">-' + "{:,}".format(-value) + '</span>'
+
+
+# socialBladePage: returns a SocialBlade monthly statistics page. dates, totals and changes describe the days listed
+# in the table, including the first day (which has no recorded change) and the current "live" day.
+def socialBladePage(username, dates, totals, changes, padding=300):
+    rows = []
+    for date, total, change in zip(dates, totals, changes):
+        rows.append('<div style="width: 860px; height: 32px; line-height: 32px; border-bottom: 1px solid #eee;">\n'
+                    '  <div style="width: 80px; float: left;">' + date.isoformat() + '</div>\n'
+                    '  <div style="width: 100px; float: left;">' + formatChange(change) + '</div>\n'
+                    '  <div style="width: 120px; float: left;">' + "{:,}".format(abs(change) // 7 + 300) +
+                    '</div>\n'
+                    '  <div style="width: 120px; float: left;">' + "{:,}".format(total) + '</div>\n'
+                    '</div>\n')
+    return ('<!DOCTYPE html>\n<html>\n<head>\n<title>' + username + ' Twitter Stats Summary Profile (Social Blade '
+            'Twitter Statistics)</title>\n<script src="/js/jquery.min.js"></script>\n</head>\n<body>\n' +
+            filler * padding + '<div id="socialblade-user-content">\n' + "".join(rows) + '</div>\n' +
+            filler * padding + '</body>\n</html>\n')
+
+
+# investingPage: returns an investing.com historical data page. dates and prices are listed from newest to oldest,
+# after a short summary table (like the real page, whose first two table rows are not historical prices).
+def investingPage(crypto, dates, prices, padding=300):
+    summary = "".join('<tr>' + "".join('<td>' + label + '</td>' for label in row) + '</tr>\n'
+                      for row in [["Prev. Close", "Open", "Day's Range", "52 wk Range", "Volume", "Market Cap",
+                                   "Circulating"], ["-", "-", "-", "-", "-", "-", "-"]])
+    rows = []
+    for date, price in zip(dates, prices):
+        cells = [date.strftime("%b %d, %Y"), formatNumber(price), formatNumber(price * 0.99),
+                 formatNumber(price * 1.02), formatNumber(price * 0.97), "245.63K", "1.18%"]
+        rows.append('<tr>' + '<td class="first left">' + cells[0] + '</td>' +
+                    "".join('<td class="greenFont">' + cell + '</td>' for cell in cells[1:]) + '</tr>\n')
+    return ('<!DOCTYPE html>\n<html>\n<head>\n<title>' + crypto + ' Historical Data - Investing.com</title>\n'
+            '</head>\n<body>\n' + filler * padding + '<table class="summary">\n' + summary + '</table>\n'
+            '<table class="genTbl closedTbl historicalTbl" id="curr_table">\n<tbody>\n' + "".join(rows) +
+            '</tbody>\n</table>\n' + filler * padding + '</body>\n</html>\n')
+
+
+# pagesFromFrames: rebuilds the SocialBlade page of a username and the investing.com page of a crypto from the
+# collected dataframes
+def pagesFromFrames(totalFollowersDF, newFollowersDF, cryptoPricesDF, username, crypto):
+    dates = [pd.Timestamp(date).date() for date in totalFollowersDF.index]
+    dates = [dates[0] - dt.timedelta(days=1)] + dates + [dates[-1] + dt.timedelta(days=1)]
+    changes = [int(change) for change in newFollowersDF[username]]
+    totals = [int(total) for total in totalFollowersDF[username]]
+    totals = [totals[0] - changes[0]] + totals + [totals[-1] + changes[-1]]
+    changes = [0] + changes + [changes[-1]]
+    socialBlade = socialBladePage(username, dates, totals, changes)
+    prices = [float(price) for price in cryptoPricesDF[crypto]]
+    priceDates = dates[1:-1]
+    # (the page also lists the two days before the collected period)
+    investing = investingPage(crypto, priceDates[::-1] + [priceDates[0] - dt.timedelta(days=1),
+                                                          priceDates[0] - dt.timedelta(days=2)],
+                              prices[::-1] + [prices[0], prices[0]])
+    return socialBlade, investing
+
+
+# main: saves fixture pages for a few accounts and cryptos
+def main():
+    directory = "./Benchmarks/Fixtures"
+    os.makedirs(directory, exist_ok=True)
+    cryptoPricesDF = pd.read_csv("./Data/csv-data/cryptoPrices.csv", index_col="Date")
+    totalFollowersDF = pd.read_csv("./Data/csv-data/totalFollowers.csv", index_col="Date")
+    newFollowersDF = pd.read_csv("./Data/csv-data/newFollowers.csv", index_col="Date")
+    totalFollowersDF.index = pd.to_datetime(totalFollowersDF.index)
+    for username, crypto in [("elonmusk", "bitcoin"), ("JoeDiPasquale", "shiba-inu")]:
+        socialBlade, investing = pagesFromFrames(totalFollowersDF, newFollowersDF, cryptoPricesDF, username, crypto)
+        with open(os.path.join(directory, "socialblade-" + username + ".html"), "w") as file:
+            file.write(socialBlade)
+        with open(os.path.join(directory, "investing-" + crypto + ".html"), "w") as file:
+            file.write(investing)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# --------------------------------------------------------------------------------------------------------------
+# heatmaps.py:
+# Draws correlation matrices in a way that scales to thousands of accounts: with matshow and one label per row and
+# column when there are few, as an RGBA image (the colors of every cell written to one buffer) with a label every
+# few rows and columns when there are many, and as an overview averaged down to the width of the plot (optionally
+# with pages of a few hundred accounts) when there are too many to show in one image. Rows and columns can be
+# reordered by hierarchical clustering, so that accounts and coins with similar correlations are drawn next to each
+# other.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import warnings
+import numpy as np
+import matplotlib as mpl
+import matplotlib.colors as mpc
+from matplotlib.cm import ScalarMappable
+try:
+    from scipy.cluster import hierarchy
+except ImportError:  # scipy is optional, clusterOrder orders by the leading singular vectors without it
+    hierarchy = None
+
+
+# labelThreshold, pageThreshold: in "auto" mode, matrices with at most labelThreshold accounts are drawn with matshow
+# and every label, larger ones as an RGBA image with at most labelThreshold labels along each axis, and matrices with
+# more than pageThreshold accounts as an overview, with pages of pageColumns accounts if drawPages is True. The
+# "pages" mode also draws pages of pageColumns accounts with every label (one image per page, so it takes longer the
+# more accounts there are).
+labelThreshold = 150
+pageThreshold = 1000
+pageColumns = 200
+drawPages = False
+
+# maxPixels: the most cells drawn along each axis of an overview; larger matrices are averaged down to this size
+maxPixels = 1200
+
+# clusterLimit: the most rows or columns clustered with scipy (the linkage takes memory quadratic in their number);
+# larger matrices are ordered by their leading singular vectors instead
+clusterLimit = 5000
+
+
+# settings: the thresholds and sizes above, which decide how a matrix is drawn and to how many pages (so that
+# buildcache.py draws matrix figures again when they change, and figures.py passes them to its worker processes)
+def settings():
+    return {"labelThreshold": labelThreshold, "pageThreshold": pageThreshold, "pageColumns": pageColumns,
+            "drawPages": drawPages, "maxPixels": maxPixels, "clusterLimit": clusterLimit}
+
+
+# configure: replaces some of the settings above, e.g. configure(drawPages=True)
+def configure(**changes):
+    unknown = [name for name in changes if name not in settings()]
+    if len(unknown) > 0:
+        raise ValueError("Unknown heatmap settings: " + ", ".join(unknown))
+    globals().update(changes)
+
+
+# chooseMode: the way a matrix with the given number of columns (accounts) is drawn: "labels", "image", "overview"
+# or "pages" (mode is one of these, or "auto" to choose by the thresholds and drawPages)
+def chooseMode(columns, mode="auto"):
+    if mode != "auto":
+        return mode
+    if columns > pageThreshold:
+        return "pages" if drawPages else "overview"
+    if columns > labelThreshold:
+        return "image"
+    return "labels"
+
+
+# getCmap: the colormap of a name, of a Colormap, or the default one if None
+def getCmap(cmap=None):
+    if isinstance(cmap, mpc.Colormap):
+        return cmap
+    return mpl.colormaps[cmap if cmap is not None else mpl.rcParams["image.cmap"]]
+
+
+# colorize: the RGBA colors (rows x columns x 4 bytes) of the values of a matrix in a colormap, with vmin and vmax at
+# either end of it, the same colors matshow draws. Missing values get the colormap's color for bad values.
+def colorize(values, cmap=None, vmin=-1, vmax=1):
+    cmap = getCmap(cmap)
+    table = np.round(cmap(np.linspace(0, 1, cmap.N)) * 255).astype("uint8")
+    missing = np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        positions = np.clip((values - vmin) / (vmax - vmin) * cmap.N, 0, cmap.N - 1)
+    rgba = table[np.where(missing, 0, positions).astype("int64")]
+    rgba[missing] = np.round(np.array(cmap.get_bad()) * 255).astype("uint8")
+    return rgba
+
+
+# fade: blends the colors of the cells that aren't marked by keep (a boolean matrix) towards white, leaving only
+# opacity of their color, e.g. so that the significant correlations stand out
+def fade(rgba, keep, opacity=0.3):
+    faded = rgba.copy()
+    faded[~keep, :3] = np.round(255 - (255 - rgba[~keep, :3].astype("float64")) * opacity).astype("uint8")
+    return faded
+
+
+# downsample: averages the values of a matrix over blocks of rows and columns so that it has at most maxRows rows and
+# maxColumns columns (maxPixels if None), ignoring missing values. Returns the averaged matrix.
+def downsample(values, maxRows=None, maxColumns=None):
+    rows, columns = values.shape
+    maxRows, maxColumns = maxRows or maxPixels, maxColumns or maxPixels
+    rowStep, columnStep = int(np.ceil(rows / maxRows)), int(np.ceil(columns / maxColumns))
+    if rowStep <= 1 and columnStep <= 1:
+        return values
+    blockRows, blockColumns = int(np.ceil(rows / rowStep)), int(np.ceil(columns / columnStep))
+    padded = np.full((blockRows * rowStep, blockColumns * columnStep), np.nan)
+    padded[:rows, :columns] = values
+    blocks = padded.reshape(blockRows, rowStep, blockColumns, columnStep)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # (blocks without any values)
+        return np.nanmean(blocks, axis=(1, 3))
+
+
+# clusterOrder: an order of the rows of a matrix that puts rows with similar values next to each other: the leaves
+# of an average-linkage hierarchical clustering with scipy, or the order of the rows along the leading singular
+# vector of the matrix without scipy or for more than clusterLimit rows. Missing values count as 0.
+def clusterOrder(values):
+    if len(values) <= 2:
+        return np.arange(len(values))
+    features = np.nan_to_num(values)
+    if hierarchy is not None and len(values) <= clusterLimit:
+        return hierarchy.leaves_list(hierarchy.linkage(features, method="average", metric="euclidean"))
+    centered = features - features.mean(axis=0)
+    return np.argsort(np.linalg.svd(centered, full_matrices=False)[0][:, 0], kind="stable")
+
+
+# clusterMatrix: a correlation matrix with its rows and columns reordered by clusterOrder
+def clusterMatrix(matrix):
+    values = matrix.to_numpy(dtype="float64", na_value=np.nan)
+    return matrix.iloc[clusterOrder(values), clusterOrder(values.T)]
+
+
+# labelTicks: sets ticks labelled by every step-th label on an axis ("x" or "y") so that there are at most maxLabels
+def labelTicks(ax, axis, labels, maxLabels, labelsize):
+    step = max(1, int(np.ceil(len(labels) / maxLabels)))
+    positions = np.arange(0, len(labels), step)
+    if axis == "x":
+        ax.set_xticks(positions)
+        ax.set_xticklabels([str(labels[i]) for i in positions], rotation=90, fontsize=labelsize)
+    else:
+        ax.set_yticks(positions)
+        ax.set_yticklabels([str(labels[i]) for i in positions], fontsize=labelsize)
+
+
+# drawColorbar: adds a horizontal colorbar of the colormap from -1 to 1 under an axes. Returns the colorbar.
+def drawColorbar(fig, ax, cmap, ticks):
+    mappable = ScalarMappable(norm=mpc.Normalize(vmin=-1, vmax=1), cmap=getCmap(cmap))
+    return fig.colorbar(mappable, ax=ax, ticks=ticks, orientation="horizontal")
+
+
+# drawImage: draws a correlation matrix (a dataframe) as one RGBA image, with the accounts along the top like matshow
+# and at most maxLabels (labelThreshold if None) labels along each axis. significant (a boolean matrix like the
+# correlation matrix, or None) fades the other cells. Returns the colorbar.
+def drawImage(fig, ax, matrix, cmap=None, ticks=None, significant=None, maxLabels=None, labelsize=5):
+    maxLabels = maxLabels or labelThreshold
+    rgba = colorize(matrix.to_numpy(dtype="float64", na_value=np.nan), cmap)
+    if significant is not None:
+        rgba = fade(rgba, significant)
+    ax.imshow(rgba, aspect="auto", interpolation="nearest")
+    ax.xaxis.tick_top()
+    labelTicks(ax, "x", matrix.columns, maxLabels, labelsize)
+    labelTicks(ax, "y", matrix.index, maxLabels, labelsize)
+    return drawColorbar(fig, ax, cmap, ticks)
+
+
+# drawOverview: draws a correlation matrix too large for one image as an overview, averaged down to maxPixels cells
+# along each axis. If pages are drawn with it (see pages), the pages of columnsPerPage accounts (pageColumns if None)
+# are marked and numbered along the top, otherwise every few accounts are labelled. significant fades the blocks
+# without any significant correlation. Returns the colorbar.
+def drawOverview(fig, ax, matrix, cmap=None, ticks=None, significant=None, withPages=False, columnsPerPage=None):
+    columnsPerPage = columnsPerPage or pageColumns
+    rows, columns = matrix.shape
+    rgba = colorize(downsample(matrix.to_numpy(dtype="float64", na_value=np.nan)), cmap)
+    if significant is not None:
+        rgba = fade(rgba, downsample(significant.astype("float64")) > 0)
+    ax.imshow(rgba, aspect="auto", interpolation="nearest", extent=(-0.5, columns - 0.5, rows - 0.5, -0.5))
+    ax.xaxis.tick_top()
+    if withPages:
+        starts = np.arange(0, columns, columnsPerPage)
+        for start in starts[1:]:
+            ax.axvline(start - 0.5, color="k", linewidth=0.3)
+        ax.set_xticks((starts + np.minimum(starts + columnsPerPage, columns) - 1) / 2)
+        ax.set_xticklabels([str(page + 1) for page in range(len(starts))], fontsize=5)
+        ax.set_xlabel("Page (" + str(columnsPerPage) + " accounts each)")
+    else:
+        labelTicks(ax, "x", matrix.columns, labelThreshold, 3)
+        step = int(np.ceil(columns / maxPixels))
+        ax.set_xlabel(str(columns) + " accounts" + (", averaged in blocks of " + str(step) if step > 1 else ""))
+    labelTicks(ax, "y", matrix.index, labelThreshold, 5)
+    return drawColorbar(fig, ax, cmap, ticks)
+
+
+# pages: the column ranges (start, stop) of the pages of a matrix with the given number of columns, columnsPerPage
+# (pageColumns if None) at a time
+def pages(columns, columnsPerPage=None):
+    columnsPerPage = columnsPerPage or pageColumns
+    return [(start, min(start + columnsPerPage, columns)) for start in range(0, columns, columnsPerPage)]
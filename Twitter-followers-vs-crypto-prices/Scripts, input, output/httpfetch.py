@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------------------------
+# httpfetch.py:
+# Fetches webpages for scraper.py without a browser, using a pooled keep-alive HTTP client driven by asyncio so
+# that many pages can be downloaded concurrently
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import asyncio
+import aiohttp
+
+
+# browser-like request headers, since some sites refuse requests that don't look like they come from a browser
+defaultHeaders = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/105.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+# HttpFetcher: downloads webpages over one shared aiohttp session. Connections are kept alive and reused between
+# requests, and at most `concurrency` requests (and `perHost` connections to a single host) are in flight at once.
+# Offers the same fetch/fetchAll interface as driverpool.DriverPool so the two can be swapped in scraper.py. The
+# synchronous methods run on an event loop the fetcher keeps open until close, so that consecutive calls reuse the
+# same session and its open connections.
+class HttpFetcher:
+    def __init__(self, concurrency=8, perHost=4, timeout=30, headers=None):
+        self.concurrency = concurrency
+        self.perHost = perHost
+        self.timeout = timeout
+        self.headers = dict(defaultHeaders if headers is None else headers)
+        self.session = None
+        self.sessionLoop = None
+        self.semaphore = None
+        self.loop = None
+
+    # openSession: creates the shared keep-alive session (must be called from inside the running event loop)
+    def openSession(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.perHost, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self.sessionLoop = asyncio.get_running_loop()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    # fetchAsync: downloads a single webpage and returns its html. The session is opened on first use, and opened
+    # again if it was closed or belongs to another event loop.
+    async def fetchAsync(self, URL):
+        if self.session is None or self.session.closed or self.sessionLoop is not asyncio.get_running_loop():
+            self.openSession()
+        async with self.semaphore:
+            async with self.session.get(URL) as response:
+                response.raise_for_status()
+                return await response.text()
+
+    # fetchAllAsync: downloads every URL concurrently and returns a dictionary of URL -> html. If a download fails,
+    # the others are cancelled before the error is raised, so that none is left running on the event loop.
+    async def fetchAllAsync(self, URLs):
+        URLs = list(dict.fromkeys(URLs))
+        tasks = [asyncio.ensure_future(self.fetchAsync(URL)) for URL in URLs]
+        try:
+            pages = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(zip(URLs, pages))
+
+    # aclose: closes the shared session and its pooled connections
+    async def aclose(self):
+        if self.session is not None:
+            await self.session.close()
+        self.session = None
+        self.sessionLoop = None
+        self.semaphore = None
+
+    # runSync: runs a coroutine to completion on the fetcher's own event loop, creating the loop on first use
+    def runSync(self, coroutine):
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+        return self.loop.run_until_complete(coroutine)
+
+    # fetch: synchronous version of fetchAsync
+    def fetch(self, URL):
+        return self.runSync(self.fetchAsync(URL))
+
+    # fetchAll: synchronous version of fetchAllAsync
+    def fetchAll(self, URLs):
+        return self.runSync(self.fetchAllAsync(URLs))
+
+    # close: closes the session opened by the synchronous methods and their event loop
+    def close(self):
+        if self.loop is None or self.loop.is_closed():
+            return
+        if self.sessionLoop is self.loop:
+            self.loop.run_until_complete(self.aclose())
+        self.loop.close()
+        self.loop = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,96 @@
+# --------------------------------------------------------------------------------------------------------------
+# incremental.py:
+# Works out which accounts, coins and dates are missing from the data already collected by scraper.py, and merges
+# newly scraped rows into it keyed by date, so that daily runs build up a long history instead of overwriting it
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import os
+import numpy as np
+import pandas as pd
+from schema import dateIndex
+
+
+# loadFrame: reads a pickled dataframe, or returns an empty dataframe indexed by Date if it doesn't exist yet (or if
+# path is None). Frames pickled with datetime.date objects in their index are given a datetime64 index.
+def loadFrame(path):
+    if path is not None and os.path.exists(path):
+        frame = pd.read_pickle(path)
+        frame.index = dateIndex(frame.index)
+        return frame
+    return pd.DataFrame(index=dateIndex([]))
+
+
+# loadHistory: loads a frame collected by previous runs from dataDirectory through columnstore.loadFrame (the column
+# store, or the pickled dataframe if there is none), or returns an empty dataframe indexed by Date if nothing has been
+# collected yet (or if dataDirectory is None)
+def loadHistory(name, dataDirectory=None):
+    if dataDirectory is not None:
+        from columnstore import loadFrame as loadCollected  # (imports pyarrow)
+        try:
+            return loadCollected(name, dataDirectory=dataDirectory)
+        except FileNotFoundError:
+            pass
+    return loadFrame(None)
+
+
+# missingEntities: returns the entities (accounts or coins) that have a value missing for at least one of the dates
+# in any of the frames, in the order they are listed. New entities that aren't in the frames yet are always missing.
+def missingEntities(frames, entities, dates):
+    missing = pd.Series(False, index=pd.Index(entities))
+    for frame in frames:
+        missing |= frame.reindex(index=dates, columns=entities).isna().any(axis=0)
+    return list(missing[missing].index)
+
+
+# missingDates: returns a boolean frame marking which of the dates (rows) have no value for each of the entities
+# (columns) in a frame, with a single reindex. Entities that aren't in the frame are missing on every date.
+def missingDates(frame, entities, dates):
+    return frame.reindex(index=dates, columns=entities).isna()
+
+
+# newRows: returns the scraped values (a dictionary of entity -> array of values, one for each of the dates) for the
+# dates that are missing from a frame, as a dictionary of entity -> Series indexed by date. Entities missing the same
+# dates share one index, so that mergeFrame can line them up without comparing their dates.
+def newRows(frame, dates, values):
+    dates = dateIndex(dates)
+    missing = missingDates(frame, list(values), dates).to_numpy()
+    indexes = {}
+    rows = {}
+    for column, (entity, entityValues) in enumerate(values.items()):
+        mask = missing[:, column]
+        key = mask.tobytes()
+        if key not in indexes:
+            indexes[key] = dates[mask]
+        rows[entity] = pd.Series(np.asarray(entityValues)[mask], index=indexes[key], name=entity, copy=False)
+    return rows
+
+
+# mergeFrame: adds new rows (a dictionary of entity -> Series from newRows) to a frame. Existing values are kept,
+# new dates are appended in date order, and new entities are added as new columns. Columns without missing values
+# keep an integer dtype holding both the existing and scraped values; columns with gaps (e.g. an account added later)
+# become floats. Columns are cast together, one block for each integer dtype.
+def mergeFrame(frame, rows):
+    rows = {entity: series for entity, series in rows.items() if len(series) > 0}
+    if len(rows) == 0:
+        return frame
+    updates = pd.DataFrame(rows)
+    columns = list(frame.columns) + [entity for entity in updates.columns if entity not in frame.columns]
+    merged = frame.combine_first(updates).reindex(columns=columns).sort_index()
+    merged.index.name = "Date"
+    frameTypes = frame.dtypes.to_dict()
+    updateTypes = {entity: series.dtype for entity, series in rows.items()}
+    complete = merged.notna().all(axis=0).to_dict()
+    blocks = {}
+    for entity in columns:
+        dtypes = [types[entity] for types in [frameTypes, updateTypes] if entity in types]
+        if complete[entity] and all(pd.api.types.is_integer_dtype(dtype) for dtype in dtypes):
+            blocks.setdefault(np.result_type(*dtypes), []).append(entity)
+    if len(blocks) == 0:
+        return merged
+    cast = [entity for entities in blocks.values() for entity in entities]
+    parts = [merged.drop(columns=cast)] + [merged[entities].astype(dtype) for dtype, entities in blocks.items()]
+    return pd.concat(parts, axis=1)[columns]
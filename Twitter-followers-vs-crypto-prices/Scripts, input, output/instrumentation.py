@@ -0,0 +1,263 @@
+# --------------------------------------------------------------------------------------------------------------
+# instrumentation.py:
+# Records the wall time, bytes fetched, memory growth and rows produced of each stage of scraper.py and
+# matplotlib-analysis.py (browser launch, page load, parsing, export, derived frames, figure rendering...), per URL or
+# figure. Records are written as JSON lines while the run goes on and summarized by stage at the end. Stages can also
+# be profiled with cProfile or traced with tracemalloc, chosen by name.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import contextvars
+import cProfile
+import fnmatch
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+try:
+    import resource
+except ImportError:  # (not available on Windows, where memory is only recorded for traced stages)
+    resource = None
+
+
+# currentStage: name of the stage being run in the current thread or asyncio task, recorded as the parent of the
+# stages started inside it
+currentStage = contextvars.ContextVar("currentStage", default=None)
+
+
+# peakRSS: peak resident memory of the process so far in bytes (None where it isn't available)
+def peakRSS():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # (kilobytes on Linux)
+
+
+# rowCount: number of rows of a value produced by a stage (a dataframe, series, array or list, or a tuple of them
+# such as the total and new followers of an account), or None if it has no rows
+def rowCount(value):
+    if isinstance(value, tuple) and len(value) > 0:
+        return rowCount(value[0])
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+# textBytes: size in bytes of a fetched webpage (text encoded as UTF-8, or bytes)
+def textBytes(text):
+    return len(text.encode("utf-8")) if isinstance(text, str) else len(text)
+
+
+# matchesAny: whether a stage name matches any of the patterns (with wildcards, e.g. "scrape.*")
+def matchesAny(name, patterns):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+# StageRecord: measurements of one run of a stage. bytes and rows can be set by the code inside the stage, and
+# other fields (e.g. the URL or figure) are passed as keyword arguments. memoryGrowth is how much the peak resident
+# memory of the process grew during the stage (0 if the stage didn't use more memory than earlier stages did), and
+# peakMemory the peak memory traced by tracemalloc, for traced stages only.
+class StageRecord:
+    def __init__(self, stage, fields):
+        self.stage = stage
+        self.fields = fields
+        self.parent = currentStage.get()
+        self.bytes = None
+        self.rows = None
+        self.seconds = None
+        self.memoryGrowth = None
+        self.peakMemory = None
+        self.error = None
+        self.started = time.time()
+
+    # toDict: the record as a dictionary written to the JSON-lines log
+    def toDict(self):
+        record = {"stage": self.stage, "started": round(self.started, 6), "seconds": round(self.seconds, 6),
+                  "bytes": self.bytes, "rows": self.rows, "memoryGrowth": self.memoryGrowth,
+                  "peakMemory": self.peakMemory, "parent": self.parent, "pid": os.getpid()}
+        record.update(self.fields)
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+
+# Recorder: collects StageRecords, appending each to logPath (if given) as a line of JSON when its stage ends.
+# Stages whose names match profilePatterns are profiled with cProfile (saved as .prof files in profileDirectory),
+# and stages matching tracePatterns also record their peak memory with tracemalloc. Tracing is started by the first
+# traced stage and stopped when the last one running ends, so the peak of a traced stage that runs inside or
+# alongside another is the highest traced memory since the first of them started. Stages can run in several threads
+# or asyncio tasks at once.
+class Recorder:
+    def __init__(self, logPath=None, profilePatterns=(), tracePatterns=(), profileDirectory="./Data/profiles"):
+        self.logPath = logPath
+        self.profilePatterns = list(profilePatterns)
+        self.tracePatterns = list(tracePatterns)
+        self.profileDirectory = profileDirectory
+        self.records = []
+        self.lock = threading.Lock()
+        self.profiling = False
+        self.profileCount = 0
+        self.tracing = 0
+        self.startedTracing = False
+        if logPath is not None:
+            os.makedirs(os.path.dirname(logPath) or ".", exist_ok=True)
+
+    # settings: the arguments of a Recorder with the same profiling and tracing, e.g. to configure worker processes
+    def settings(self):
+        return {"profilePatterns": self.profilePatterns, "tracePatterns": self.tracePatterns,
+                "profileDirectory": self.profileDirectory}
+
+    # stage: context manager recording a run of a stage, e.g.
+    # "with recorder.stage("scrape.fetch", URL=URL) as record: ... record.bytes = len(html)"
+    @contextmanager
+    def stage(self, name, **fields):
+        record = StageRecord(name, fields)
+        profiler = self.startProfile(name)
+        tracing = self.startTrace(name)
+        startRSS = peakRSS()
+        token = currentStage.set(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as error:
+            record.error = repr(error)
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            currentStage.reset(token)
+            if startRSS is not None:
+                record.memoryGrowth = peakRSS() - startRSS
+            if tracing:
+                record.peakMemory = self.stopTrace()
+            self.stopProfile(profiler, name)
+            self.add(record.toDict())
+
+    # startTrace: counts a stage as traced if its name matches tracePatterns, starting tracemalloc if no traced stage
+    # is running (and it wasn't started by other code). Returns whether the stage is traced.
+    def startTrace(self, name):
+        if not matchesAny(name, self.tracePatterns):
+            return False
+        with self.lock:
+            if self.tracing == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.startedTracing = True
+            self.tracing += 1
+        return True
+
+    # stopTrace: ends a traced stage, stopping tracemalloc when no other traced stage is running (if startTrace started
+    # it). Returns the peak traced memory in bytes.
+    def stopTrace(self):
+        with self.lock:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.tracing -= 1
+            if self.tracing == 0 and self.startedTracing:
+                tracemalloc.stop()
+                self.startedTracing = False
+        return peak
+
+    # startProfile: starts profiling a stage if its name matches profilePatterns, unless another stage is already
+    # being profiled (cProfile can only profile one stage at a time). Returns the profiler, or None.
+    def startProfile(self, name):
+        if not matchesAny(name, self.profilePatterns):
+            return None
+        with self.lock:
+            if self.profiling:
+                return None
+            self.profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    # stopProfile: stops a profiler started by startProfile and saves its statistics, named after the stage
+    def stopProfile(self, profiler, name):
+        if profiler is None:
+            return
+        profiler.disable()
+        os.makedirs(self.profileDirectory, exist_ok=True)
+        with self.lock:
+            self.profileCount += 1
+            fileName = re.sub(r"[^\w.-]", "_", name) + "-" + str(os.getpid()) + "-" + str(self.profileCount)
+            self.profiling = False
+        profiler.dump_stats(os.path.join(self.profileDirectory, fileName + ".prof"))
+
+    # add: stores a record (a dictionary from StageRecord.toDict) and appends it to the log
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+            if self.logPath is not None:
+                with open(self.logPath, "a") as file:
+                    file.write(json.dumps(record, default=str) + "\n")
+
+    # extend: adds records made by another recorder, e.g. in a worker process
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    # drain: returns the records collected so far and forgets them
+    def drain(self):
+        with self.lock:
+            records, self.records = self.records, []
+        return records
+
+    # summary: totals of the records by stage, in order of first run: number of runs and failures, total and
+    # longest wall time, total bytes and rows, and largest memory growth and traced peak memory
+    def summary(self):
+        stages = {}
+        with self.lock:
+            records = list(self.records)
+        for record in records:
+            totals = stages.setdefault(record["stage"], {"runs": 0, "errors": 0, "seconds": 0.0, "maxSeconds": 0.0,
+                                                         "bytes": 0, "rows": 0, "memoryGrowth": None,
+                                                         "peakMemory": None})
+            totals["runs"] += 1
+            totals["errors"] += "error" in record
+            totals["seconds"] += record["seconds"]
+            totals["maxSeconds"] = max(totals["maxSeconds"], record["seconds"])
+            totals["bytes"] += record["bytes"] or 0
+            totals["rows"] += record["rows"] or 0
+            for key in ["memoryGrowth", "peakMemory"]:
+                if record.get(key) is not None:
+                    totals[key] = max(totals[key] or 0, record[key])
+        return stages
+
+    # report: the summary as a table of text lines ("RSS +MB" is the largest growth of the process's peak resident
+    # memory during a run of the stage, "traced MB" the highest peak traced by tracemalloc)
+    def report(self):
+        lines = ["{:<24}{:>6}{:>7}{:>11}{:>10}{:>11}{:>10}{:>11}{:>11}".format(
+            "Stage", "runs", "errors", "total (s)", "max (s)", "MB", "rows", "RSS +MB", "traced MB")]
+        for name, totals in self.summary().items():
+            growth, peak = ["{:.1f}".format(totals[key] / 2 ** 20) if totals[key] is not None else "-"
+                            for key in ["memoryGrowth", "peakMemory"]]
+            lines.append("{:<24}{:>6}{:>7}{:>11.3f}{:>10.3f}{:>11.2f}{:>10}{:>11}{:>11}".format(
+                name, totals["runs"], totals["errors"], totals["seconds"], totals["maxSeconds"],
+                totals["bytes"] / 2 ** 20, totals["rows"], growth, peak))
+        return lines
+
+
+# recorder: the recorder used by the instrumented modules, replaced by configure
+recorder = Recorder()
+
+
+# configure: replaces the recorder used by the instrumented modules (see Recorder for the arguments)
+def configure(logPath=None, profilePatterns=(), tracePatterns=(), profileDirectory="./Data/profiles"):
+    global recorder
+    recorder = Recorder(logPath, profilePatterns, tracePatterns, profileDirectory)
+    return recorder
+
+
+# stage: records a stage with the current recorder (see Recorder.stage)
+def stage(name, **fields):
+    return recorder.stage(name, **fields)
+
+
+# printReport: prints the end-of-run summary of the current recorder
+def printReport():
+    print("\r" + "\n".join(recorder.report()))
@@ -0,0 +1,130 @@
+# --------------------------------------------------------------------------------------------------------------
+# linerender.py:
+# Draws the columns of a dataframe as lines over dates in a way that scales to thousands of accounts: as individual
+# lines when there are few, as one LineCollection downsampled to the width of the plot in pixels when there are
+# many, and as quantile bands (the spread of the accounts on each date) when there are too many to tell apart
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import warnings
+import numpy as np
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+
+# collectionThreshold, bandThreshold: in "auto" mode, frames with more columns than collectionThreshold are drawn as
+# a LineCollection, and frames with more columns than bandThreshold as quantile bands
+collectionThreshold = 100
+bandThreshold = 2000
+
+# bands: quantile ranges drawn in "bands" mode (widest first) with their opacity, around a median line
+bands = [((0.05, 0.95), 0.2), ((0.25, 0.75), 0.35)]
+
+
+# chooseMode: the way a frame with the given number of columns is drawn: "lines", "collection" or "bands" (mode is
+# one of these, or "auto" to choose by the thresholds)
+def chooseMode(columns, mode="auto"):
+    if mode != "auto":
+        return mode
+    if columns > bandThreshold:
+        return "bands"
+    if columns > collectionThreshold:
+        return "collection"
+    return "lines"
+
+
+# dateNumbers: matplotlib's numbers for the dates of an index, and sets up the x axis to show them as dates
+def dateNumbers(ax, index):
+    ax.xaxis_date()
+    return mdates.date2num(pd.to_datetime(pd.Index(index)).to_pydatetime())
+
+
+# downsample: reduces each column of values (rows x columns, with x the position of each row) to at most 4 points per
+# bin of rows, with about `pixels` bins: the first, minimum, maximum and last value of the bin, in order. The drawn
+# lines then look the same as with every point at that width, since a pixel column can only show the range of values
+# the line passes through. Returns the x positions and values of the kept points (points x columns).
+def downsample(x, values, pixels):
+    rows, columns = values.shape
+    binSize = int(np.ceil(rows / max(int(pixels), 1)))
+    if binSize <= 4:
+        return np.repeat(x[:, None], columns, axis=1), values
+    bins = int(np.ceil(rows / binSize))
+    padded = np.vstack([values, np.full((bins * binSize - rows, columns), np.nan)]).reshape(bins, binSize, columns)
+    missing = np.isnan(padded)
+    offsets = np.stack([np.zeros((bins, columns), dtype="int64"),
+                        np.where(missing, np.inf, padded).argmin(axis=1),
+                        np.where(missing, -np.inf, padded).argmax(axis=1),
+                        np.full((bins, columns), binSize - 1)], axis=1)
+    offsets.sort(axis=1)
+    indices = np.minimum(np.arange(bins)[:, None, None] * binSize + offsets, rows - 1).reshape(4 * bins, columns)
+    return x[indices], np.take_along_axis(values, indices, axis=0)
+
+
+# pixelWidth: width of the plotting area of an axes in pixels when saved at the given dpi
+def pixelWidth(ax, dpi):
+    return ax.get_window_extent().width * dpi / ax.figure.dpi
+
+
+# cycleColors: the colors that ax.plot would give to the given number of lines (matplotlib's color cycle)
+def cycleColors(count):
+    colors = mpl.rcParams["axes.prop_cycle"].by_key()["color"]
+    return [colors[i % len(colors)] for i in range(count)]
+
+
+# drawCollection: draws every column as a line of a single LineCollection, downsampled to the width of the plot.
+# Returns one legend handle per column.
+def drawCollection(ax, frame, dpi, color=None, alpha=None, label=None):
+    x = dateNumbers(ax, frame.index)
+    values = frame.to_numpy(dtype="float64", na_value=np.nan)
+    xs, ys = downsample(x, values, pixelWidth(ax, dpi))
+    colors = [color] * values.shape[1] if color is not None else cycleColors(values.shape[1])
+    lines = LineCollection(np.stack([xs.T, ys.T], axis=2), colors=colors, alpha=alpha,
+                           linewidths=mpl.rcParams["lines.linewidth"])
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return [Line2D([], [], color=lineColor, alpha=alpha, label=label) for lineColor in colors]
+
+
+# drawBands: draws the median of the columns on each date and the quantile ranges of `bands` around it, in the given
+# color (the first color of the cycle if None). Returns legend handles for the median and each band, labelled with
+# the label (if any) and the number of accounts.
+def drawBands(ax, frame, color=None, alpha=None, label=None):
+    x = dateNumbers(ax, frame.index)
+    values = frame.to_numpy(dtype="float64", na_value=np.nan)
+    color = color if color is not None else cycleColors(1)[0]
+    prefix = (label + ": " if label is not None else "")
+    handles = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # (dates where no account has a value)
+        for (low, high), opacity in bands:
+            lower, upper = np.nanquantile(values, [low, high], axis=1)
+            ax.fill_between(x, lower, upper, color=color, alpha=opacity, linewidth=0)
+            handles.append(Patch(color=color, alpha=opacity, label=prefix + "{:.0%}".format(low) + " to " +
+                                 "{:.0%}".format(high) + " of " + str(values.shape[1]) + " accounts"))
+        median = np.nanmedian(values, axis=1)
+    ax.plot(x, median, color=color, alpha=alpha)
+    handles.insert(0, Line2D([], [], color=color, alpha=alpha, label=prefix + "median"))
+    return handles
+
+
+# plotFrame: draws the columns of a frame over its dates, in the given mode (see chooseMode). Single-color frames are
+# drawn with color and alpha (cycling through matplotlib's colors if color is None). Returns the legend handles:
+# one per column in the "lines" and "collection" modes, or the median and bands in the "bands" mode.
+def plotFrame(ax, frame, mode="auto", dpi=200, color=None, alpha=None, label=None):
+    mode = chooseMode(len(frame.columns), mode)
+    if len(frame.columns) == 0:
+        return []
+    if mode == "bands":
+        return drawBands(ax, frame, color, alpha, label)
+    if mode == "collection":
+        return drawCollection(ax, frame, dpi, color, alpha, label)
+    if color is None:
+        return ax.plot(frame, alpha=alpha, label=label)
+    return ax.plot(frame, color, alpha=alpha, label=label)
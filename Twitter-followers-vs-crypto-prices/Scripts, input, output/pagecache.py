@@ -0,0 +1,196 @@
+# --------------------------------------------------------------------------------------------------------------
+# pagecache.py:
+# On-disk cache of the raw html of webpages fetched by scraper.py, so that rerunning the scraper on the same day
+# (or rerunning only the parsing after changing it) doesn't download the same pages again
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import asyncio
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# PageCache: stores gzip-compressed html in `directory`, keyed by the hash of the URL and the day it was fetched.
+# Entries older than `ttl` seconds are treated as missing, and the least recently used entries are evicted once
+# the cache grows beyond `maxBytes`. An index file keeps track of entry sizes and creation/access times.
+class PageCache:
+    def __init__(self, directory="./Data/page-cache", ttl=24 * 60 * 60, maxBytes=200 * 2 ** 20):
+        self.directory = directory
+        self.ttl = ttl
+        self.maxBytes = maxBytes
+        self.indexPath = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.indexPath):
+            with open(self.indexPath, "r") as file:
+                self.index = json.load(file)
+
+    # key: content address of a webpage fetched on a given day
+    @staticmethod
+    def key(URL, day=None):
+        day = (day or dt.date.today()).isoformat()
+        return hashlib.sha256((day + " " + URL).encode("utf-8")).hexdigest()
+
+    # path: location of an entry's compressed html
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".html.gz")
+
+    # get: returns the cached html of a webpage, or None if it isn't cached or has expired
+    def get(self, URL, day=None):
+        key = self.key(URL, day)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is not None and time.time() - entry["created"] > self.ttl:
+                self.remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                with gzip.open(self.path(key), "rb") as file:
+                    html = file.read().decode("utf-8")
+            except OSError:
+                self.remove(key)
+                self.misses += 1
+                return None
+            entry["accessed"] = time.time()
+            self.hits += 1
+            return html
+
+    # put: stores the html of a webpage and evicts least recently used entries if the cache is too large
+    def put(self, URL, html, day=None):
+        key = self.key(URL, day)
+        data = gzip.compress(html.encode("utf-8"))
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path(key)), exist_ok=True)
+            temporaryPath = self.path(key) + ".tmp"
+            with open(temporaryPath, "wb") as file:
+                file.write(data)
+            os.replace(temporaryPath, self.path(key))
+            now = time.time()
+            self.index[key] = {"URL": URL, "created": now, "accessed": now, "size": len(data)}
+            self.evict()
+            self.saveIndex()
+
+    # remove: deletes an entry (the lock must be held)
+    def remove(self, key):
+        self.index.pop(key, None)
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    # evict: removes expired entries, then least recently used entries until the cache fits in maxBytes
+    # (the lock must be held)
+    def evict(self):
+        now = time.time()
+        for key in [key for key, entry in self.index.items() if now - entry["created"] > self.ttl]:
+            self.remove(key)
+        totalBytes = sum(entry["size"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda key: self.index[key]["accessed"]):
+            if totalBytes <= self.maxBytes:
+                break
+            totalBytes -= self.index[key]["size"]
+            self.remove(key)
+
+    # saveIndex: writes the index to disk (the lock must be held)
+    def saveIndex(self):
+        temporaryPath = self.indexPath + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump(self.index, file)
+        os.replace(temporaryPath, self.indexPath)
+
+    # size: total compressed size of the cached pages in bytes
+    def size(self):
+        return sum(entry["size"] for entry in self.index.values())
+
+    # hitRate: fraction of lookups that were served from the cache
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    # report: one-line summary of cache usage
+    def report(self):
+        return ("Page cache: " + str(self.hits) + " hits, " + str(self.misses) + " misses (hit rate " +
+                "{:.1%}".format(self.hitRate()) + "), " + str(len(self.index)) + " pages, " +
+                "{:.1f}".format(self.size() / 2 ** 20) + " MB")
+
+    # close: saves the access times recorded since the last write
+    def close(self):
+        with self.lock:
+            self.saveIndex()
+
+
+# CachedFetcher: wraps a fetch backend (driverpool.DriverPool or httpfetch.HttpFetcher) so that pages are read from
+# a PageCache when possible and stored in it after being fetched. With offline=True, pages that aren't cached
+# raise a LookupError instead of being fetched, e.g. to rerun only the parsing on pages fetched earlier that day.
+class CachedFetcher:
+    def __init__(self, fetcher, cache, offline=False):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.offline = offline
+
+    # miss: handles a page that isn't cached
+    def miss(self, URL):
+        if self.offline:
+            raise LookupError("Page is not cached: " + URL)
+
+    # fetch: returns the html of a webpage from the cache, or fetches and caches it
+    def fetch(self, URL):
+        html = self.cache.get(URL)
+        if html is None:
+            self.miss(URL)
+            html = self.fetcher.fetch(URL)
+            self.cache.put(URL, html)
+        return html
+
+    # fetchAsync: asynchronous version of fetch. throttle (an async function of the URL, e.g. a rate limiter's
+    # acquire) is awaited before a page is fetched, and not for pages read from the cache.
+    async def fetchAsync(self, URL, throttle=None):
+        html = self.cache.get(URL)
+        if html is None:
+            self.miss(URL)
+            if throttle is not None:
+                await throttle(URL)
+            if hasattr(self.fetcher, "fetchAsync"):
+                html = await self.fetcher.fetchAsync(URL)
+            else:
+                html = await asyncio.to_thread(self.fetcher.fetch, URL)
+            self.cache.put(URL, html)
+        return html
+
+    # fetchAll: returns a dictionary of URL -> html, fetching only the pages that aren't cached
+    def fetchAll(self, URLs):
+        pages = {}
+        for URL in dict.fromkeys(URLs):
+            pages[URL] = self.cache.get(URL)
+        missing = [URL for URL, html in pages.items() if html is None]
+        for URL in missing:
+            self.miss(URL)
+        if len(missing) > 0:
+            fetched = self.fetcher.fetchAll(missing)
+            for URL, html in fetched.items():
+                self.cache.put(URL, html)
+            pages.update(fetched)
+        return pages
+
+    # aclose: closes the wrapped backend's async session, if it has one
+    async def aclose(self):
+        if hasattr(self.fetcher, "aclose"):
+            await self.fetcher.aclose()
+
+    # close: closes the wrapped backend and saves the cache index
+    def close(self):
+        self.fetcher.close()
+        self.cache.close()
@@ -0,0 +1,123 @@
+# --------------------------------------------------------------------------------------------------------------
+# pairsearch.py:
+# Finds the Twitter account / cryptocurrency pairs with the strongest correlations, optionally across lags, instead
+# of checking hand-picked pairs. Accounts are read and correlated a block at a time, and only the k strongest pairs
+# found so far are kept (with a partial selection of each block), so that memory stays bounded by the block size
+# however many accounts are watched.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import columnstore
+from correlation import correlationMatrix, laggedCorrelation
+
+
+# blockSizeFor: number of accounts per block so that the correlations of a block (and the temporary arrays used to
+# compute them, a few times as large) take about maxBytes
+def blockSizeFor(assets, lags, maxBytes):
+    return max(1, int(maxBytes // (64 * max(assets, 1) * max(lags, 1))))
+
+
+# frameBlocks: splits a dataframe into blocks of at most blockSize columns
+def frameBlocks(frame, blockSize):
+    for start in range(0, len(frame.columns), blockSize):
+        yield frame.iloc[:, start:start + blockSize]
+
+
+# storeBlocks: reads a frame from the column store (see columnstore.py) a block of at most blockSize columns at a
+# time, keeping the dates from start to end (all if None)
+def storeBlocks(name, blockSize, root="./Data/arrow-data", start=None, end=None):
+    columns = columnstore.columnNames(name, root)
+    for first in range(0, len(columns), blockSize):
+        yield columnstore.readFrame(name, root, columns[first:first + blockSize], start, end)
+
+
+# selectTop: positions of the k largest scores (in no particular order), with a partial selection instead of a sort
+def selectTop(scores, k):
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    return np.argpartition(-scores, k - 1)[:k]
+
+
+# topPairs: returns the k (account, asset, lag) triples with the strongest correlations between the columns of
+# assetsDF and the accounts, with assetsDF shifted by each of the lags (a positive lag correlates the assets' values
+# with the accounts' values lag days later, see correlation.laggedCorrelation). accounts is a dataframe, split into
+# blocks of accounts taking about maxBytes, or an iterable of dataframes (e.g. storeBlocks). Pairs are ranked by
+# absolute correlation, or by correlation if absolute is False, and returned strongest first as a dataframe with the
+# columns account, asset, lag and correlation.
+def topPairs(assetsDF, accounts, k=10, lags=(0,), absolute=True, maxBytes=2 ** 26):
+    lags = list(lags)
+    if isinstance(accounts, pd.DataFrame):
+        accounts = frameBlocks(accounts, blockSizeFor(len(assetsDF.columns), len(lags), maxBytes))
+    kept = {"score": np.empty(0), "correlation": np.empty(0), "lag": np.empty(0, dtype="int64"),
+            "asset": np.empty(0, dtype="int64"), "account": np.empty(0, dtype=object)}
+    for block in accounts:
+        if lags == [0]:
+            cube = correlationMatrix(assetsDF, block).to_numpy()[None]
+        else:
+            cube = laggedCorrelation(assetsDF, block, lags).to_numpy().reshape(len(lags), len(assetsDF.columns), -1)
+        correlations = cube.ravel()
+        scores = np.abs(correlations) if absolute else correlations
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        positions = selectTop(scores, k)
+        positions = positions[scores[positions] > -np.inf]
+        lagPositions, assetPositions, accountPositions = np.unravel_index(positions, cube.shape)
+        found = {"score": scores[positions], "correlation": correlations[positions],
+                 "lag": np.array(lags, dtype="int64")[lagPositions], "asset": assetPositions,
+                 "account": np.asarray(block.columns, dtype=object)[accountPositions]}
+        kept = {key: np.concatenate([kept[key], found[key]]) for key in kept}
+        best = selectTop(kept["score"], k)
+        kept = {key: values[best] for key, values in kept.items()}
+    order = np.argsort(-kept["score"], kind="stable")
+    return pd.DataFrame({"account": kept["account"][order], "asset": assetsDF.columns[kept["asset"][order]],
+                         "lag": kept["lag"][order], "correlation": kept["correlation"][order]})
+
+
+# describePair: one line describing a pair found by topPairs (a row of its result), e.g. "Correlation between
+# @stablekwon's new follower count and terra-luna-v2 prices: 0.831", where metric is e.g. "new follower count"
+def describePair(pair, metric):
+    text = ("Correlation between @" + str(pair.account) + "'s " + metric + " and " + str(pair.asset) + " prices: " +
+            "{:.3f}".format(pair.correlation))
+    if pair.lag != 0:
+        days = str(abs(pair.lag)) + (" day " if abs(pair.lag) == 1 else " days ")
+        text += " (followers " + days + ("after" if pair.lag > 0 else "before") + " prices)"
+    return text
+
+
+# main: prints the account / cryptocurrency pairs with the strongest correlations, reading the accounts from the
+# column store a block at a time if it exists
+def main():
+    parser = argparse.ArgumentParser(description="Finds the account / coin pairs with the strongest correlations")
+    parser.add_argument("--followers", choices=["new", "total"], default="new",
+                        help="correlate crypto prices with new (daily) or total followers")
+    parser.add_argument("-k", "--top", type=int, default=10, help="number of pairs to find")
+    parser.add_argument("--max-lag", type=int, default=0,
+                        help="also search lags of up to this many days between prices and followers")
+    parser.add_argument("--positive", action="store_true",
+                        help="find the strongest positive correlations instead of the largest absolute ones")
+    parser.add_argument("--max-memory", type=float, default=64,
+                        help="approximate memory in MB used by the correlations of a block of accounts")
+    parser.add_argument("--data", default="./Data", metavar="DIRECTORY", help="folder the data is read from")
+    arguments = parser.parse_args()
+    name = arguments.followers + "Followers"
+    lags = range(-arguments.max_lag, arguments.max_lag + 1)
+    cryptoPricesDF = columnstore.loadFrame("cryptoPrices", dataDirectory=arguments.data)
+    maxBytes = arguments.max_memory * 2 ** 20
+    root = os.path.join(arguments.data, "arrow-data")
+    if os.path.isdir(os.path.join(root, name)):
+        accounts = storeBlocks(name, blockSizeFor(len(cryptoPricesDF.columns), len(lags), maxBytes), root)
+    else:
+        accounts = columnstore.loadFrame(name, dataDirectory=arguments.data)
+    pairs = topPairs(cryptoPricesDF, accounts, arguments.top, lags, not arguments.positive, maxBytes)
+    for pair in pairs.itertuples():
+        print(describePair(pair, arguments.followers + " follower count"))
+
+
+if __name__ == "__main__":
+    main()
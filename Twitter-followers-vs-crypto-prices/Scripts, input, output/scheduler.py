@@ -0,0 +1,184 @@
+# --------------------------------------------------------------------------------------------------------------
+# scheduler.py:
+# Runs the scraping jobs of scraper.py (one job per Twitter account and per cryptocurrency) with per-host rate
+# limits, retries with exponential backoff, and a checkpoint file so that a restarted run only fetches the pages
+# that are still missing
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import asyncio
+import os
+import pickle
+import random
+import time
+from urllib.parse import urlsplit
+import instrumentation
+from pagecache import CachedFetcher
+
+
+# TokenBucket: rate limiter allowing `rate` requests per second on average, with bursts of up to `capacity`
+# requests. Waiting callers are served in the order they arrived.
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("TokenBucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = None
+
+    # acquire: waits until a token is available and takes it
+    async def acquire(self):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# ScrapeJob: a single webpage to fetch, identified by a unique key, and the function turning its html into a result
+class ScrapeJob:
+    def __init__(self, key, URL, parse):
+        self.key = key
+        self.URL = URL
+        self.parse = parse
+
+
+# Checkpoint: append-only file of finished (key, result) records. A record is written as soon as a job finishes, so
+# an interrupted run loses at most the jobs that were in progress.
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+
+    # load: reads every complete record, ignoring a record that was cut off by a crash
+    def load(self):
+        results = {}
+        if not os.path.exists(self.path):
+            return results
+        with open(self.path, "rb") as file:
+            while True:
+                try:
+                    key, result = pickle.load(file)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                results[key] = result
+        return results
+
+    # append: writes one finished record to disk
+    def append(self, key, result):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "ab") as file:
+            pickle.dump((key, result), file)
+            file.flush()
+            os.fsync(file.fileno())
+
+    # clear: removes the checkpoint once its results are no longer needed
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# ScrapeScheduler: runs ScrapeJobs concurrently through a fetch backend (driverpool.DriverPool or
+# httpfetch.HttpFetcher). Requests to each host are limited by a token bucket, failed jobs (failed fetch or failed
+# parse) are retried with exponential backoff, and finished jobs are checkpointed and skipped on the next run.
+class ScrapeScheduler:
+    def __init__(self, fetcher, checkpointPath=None, concurrency=4, hostRates=None, defaultRate=1.0, burst=2,
+                 retries=3, backoff=2.0, maxBackoff=60.0):
+        self.fetcher = fetcher
+        self.checkpoint = Checkpoint(checkpointPath) if checkpointPath else None
+        self.concurrency = concurrency
+        self.hostRates = dict(hostRates or {})
+        self.defaultRate = defaultRate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.buckets = {}
+
+    # bucket: returns the token bucket for the host of a URL
+    def bucket(self, URL):
+        host = urlsplit(URL).hostname
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.hostRates.get(host, self.defaultRate), self.burst)
+        return self.buckets[host]
+
+    # throttle: waits for a token of the token bucket of the host of a URL
+    async def throttle(self, URL):
+        await self.bucket(URL).acquire()
+
+    # fetch: downloads a page, natively for async backends and in a worker thread for blocking ones, after waiting
+    # for its host's rate limit. Pages read from a CachedFetcher's cache aren't rate limited, since they aren't
+    # downloaded.
+    async def fetch(self, URL):
+        if isinstance(self.fetcher, CachedFetcher):
+            return await self.fetcher.fetchAsync(URL, self.throttle)
+        await self.throttle(URL)
+        if hasattr(self.fetcher, "fetchAsync"):
+            return await self.fetcher.fetchAsync(URL)
+        return await asyncio.to_thread(self.fetcher.fetch, URL)
+
+    # runJob: fetches (see fetch) and parses a job, retrying with exponential backoff and jitter on failure
+    async def runJob(self, job, semaphore):
+        for attempt in range(self.retries + 1):
+            try:
+                async with semaphore:
+                    with instrumentation.stage("scrape.fetch", URL=job.URL, key=job.key, attempt=attempt) as record:
+                        html = await self.fetch(job.URL)
+                        record.bytes = instrumentation.textBytes(html)
+                with instrumentation.stage("scrape.parse", URL=job.URL, key=job.key) as record:
+                    result = job.parse(html)
+                    record.rows = instrumentation.rowCount(result)
+            except Exception as error:
+                if attempt == self.retries:
+                    raise
+                delay = min(self.maxBackoff, self.backoff * 2 ** attempt)
+                print("\rRetrying " + job.key + " in {:.1f}s after error: ".format(delay) + repr(error))
+                await asyncio.sleep(delay * random.uniform(0.5, 1))
+            else:
+                if self.checkpoint is not None:
+                    self.checkpoint.append(job.key, result)
+                return result
+
+    # runAsync: runs every job that is not already checkpointed. Returns a dictionary of key -> result for finished
+    # jobs and a dictionary of key -> exception for jobs that failed after all retries.
+    async def runAsync(self, jobs):
+        results = self.checkpoint.load() if self.checkpoint is not None else {}
+        pending = [job for job in jobs if job.key not in results]
+        if len(pending) < len(jobs):
+            print("\rResuming from checkpoint: " + str(len(jobs) - len(pending)) + " of " + str(len(jobs)) +
+                  " jobs already finished")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            outcomes = await asyncio.gather(*[self.runJob(job, semaphore) for job in pending],
+                                            return_exceptions=True)
+        finally:
+            if hasattr(self.fetcher, "aclose"):
+                await self.fetcher.aclose()
+        failures = {}
+        for job, outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                failures[job.key] = outcome
+            else:
+                results[job.key] = outcome
+        return results, failures
+
+    # run: synchronous version of runAsync
+    def run(self, jobs):
+        return asyncio.run(self.runAsync(jobs))
+
+    # clearCheckpoint: removes the checkpoint, e.g. once a run's results have been exported
+    def clearCheckpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
@@ -0,0 +1,214 @@
+# --------------------------------------------------------------------------------------------------------------
+# schema.py:
+# Compact typed layout of the dataframes collected by scraper.py: a datetime64 "Date" index, follower counts
+# downcast to the smallest safe integer type, prices stored as float32 when no digits are lost, checks of the
+# assembled frames before they are exported, and an optional long layout with categorical entities and metrics
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import io
+import numpy as np
+import pandas as pd
+
+
+# significantDigits: values with at most this many significant digits are stored as float32. Every decimal number of
+# 6 significant digits is recovered exactly from the nearest float32 (see toFloat64); investing.com shows prices with
+# at most 6 significant digits.
+significantDigits = 6
+
+# integerTypes: integer types tried when downcasting, smallest first
+integerTypes = ["int8", "int16", "int32", "int64"]
+
+# metrics: names of the dataframes collected by scraper.py and the metric of their values in the long layout
+metrics = {"cryptoPrices": "price", "totalFollowers": "total_followers", "newFollowers": "new_followers"}
+
+
+# dateIndex: converts an index or array of dates (datetime.date objects, strings or datetime64 values) into a
+# datetime64[ns] index of days named "Date" (the same resolution whatever the input, so that indexes can be joined)
+def dateIndex(dates):
+    return pd.DatetimeIndex(pd.to_datetime(pd.Index(dates)).astype("datetime64[ns]"), name="Date").normalize()
+
+
+# decimalExponents: power of ten of the last significant digit of each value when written with `digits`
+# significant digits (0 for zeros and missing values)
+def decimalExponents(values, digits=significantDigits):
+    magnitudes = np.abs(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponents = np.floor(np.log10(magnitudes)) - (digits - 1)
+    return np.where(np.isfinite(exponents), exponents, 0)
+
+
+# roundSignificant: rounds values to `digits` significant digits, giving the float64 nearest to the rounded decimal
+# number (dividing or multiplying an integer by an exact power of ten)
+def roundSignificant(values, digits=significantDigits):
+    values = np.asarray(values, dtype="float64")
+    exponents = decimalExponents(values, digits)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = np.where(exponents < 0, values * 10.0 ** -exponents, values / 10.0 ** exponents)
+        digitsOnly = np.round(scaled)
+        return np.where(exponents < 0, digitsOnly / 10.0 ** -exponents, digitsOnly * 10.0 ** exponents)
+
+
+# fitsFloat32: whether every value of each column of a float64 array is missing, or has at most significantDigits
+# significant digits and lies in float32's normal range, so that it can be stored as float32 without losing digits
+def fitsFloat32(values):
+    present = ~np.isnan(values)
+    magnitudes = np.abs(np.where(present, values, 1))
+    info = np.finfo("float32")
+    inRange = (magnitudes == 0) | ((magnitudes >= info.tiny) & (magnitudes <= info.max))
+    exact = np.where(present, roundSignificant(values) == values, True)
+    return (inRange & exact).all(axis=0)
+
+
+# toFloat64: converts float32 values stored by compactFrame back into the float64 values they were parsed as (a
+# plain cast would give e.g. 24302.80078125 instead of 24302.8). Other values are returned as float64 unchanged.
+def toFloat64(values):
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return roundSignificant(values.astype("float64"))
+    return values.astype("float64")
+
+
+# integerTargets: for each column of an integer array, the smallest integer type no smaller than `smallest` that
+# holds all of its values
+def integerTargets(values, smallest="int32"):
+    lows, highs = values.min(axis=0, initial=0), values.max(axis=0, initial=0)
+    targets = np.full(values.shape[1], values.dtype, dtype=object)
+    for name in reversed(integerTypes[integerTypes.index(smallest):]):
+        fits = (lows >= np.iinfo(name).min) & (highs <= np.iinfo(name).max)
+        targets[fits] = np.dtype(name)
+    return targets
+
+
+# compactFrame: returns a frame with a datetime64 "Date" index, integer columns downcast to the smallest integer type
+# holding their values (no smaller than smallestInteger, int32 by default so that sums and differences of follower
+# counts don't overflow), and float columns stored as float32 where no digits are lost (see fitsFloat32). Columns
+# of the same dtype are checked together, so that frames of tens of thousands of columns are converted quickly.
+def compactFrame(frame, smallestInteger="int32"):
+    columns = {}
+    for dtype in frame.dtypes.unique():
+        block = frame.loc[:, (frame.dtypes == dtype).values]
+        values = block.to_numpy()
+        if pd.api.types.is_integer_dtype(dtype):
+            targets = integerTargets(values, smallestInteger)
+        elif dtype == np.float64:
+            targets = np.where(fitsFloat32(values), np.dtype("float32"), np.dtype("float64"))
+        else:
+            targets = [dtype] * len(block.columns)
+        for position, (column, target) in enumerate(zip(block.columns, targets)):
+            columns[column] = values[:, position].astype(target)
+    return pd.DataFrame({column: columns[column] for column in frame.columns}, index=dateIndex(frame.index),
+                        columns=frame.columns)
+
+
+# widenIntegers: returns a frame with integer columns of types smaller than `smallest` (int32 by default, like
+# compactFrame) converted to it, e.g. for frames stored with smaller types on disk, so that sums and differences of
+# follower counts don't overflow
+def widenIntegers(frame, smallest="int32"):
+    narrow = {column: smallest for column, dtype in frame.dtypes.items()
+              if pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < np.dtype(smallest).itemsize}
+    return frame.astype(narrow) if len(narrow) > 0 else frame
+
+
+# validateFrame: checks a frame assembled by scraper.py before it is exported, raising a ValueError describing every
+# problem: the index must be unique, increasing dates, the columns unique and numeric, prices positive and follower
+# totals non-negative (name is one of the keys of metrics)
+def validateFrame(frame, name):
+    problems = []
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        problems.append("the index holds " + str(frame.index.dtype) + " values instead of datetime64 dates")
+    if not frame.index.is_unique:
+        problems.append("dates appear more than once: " + ", ".join(map(str, frame.index[frame.index.duplicated()])))
+    if not frame.index.is_monotonic_increasing:
+        problems.append("dates are not in increasing order")
+    if not frame.columns.is_unique:
+        problems.append("columns appear more than once: " + ", ".join(frame.columns[frame.columns.duplicated()]))
+    nonNumeric = [column for column, dtype in frame.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+    if len(nonNumeric) > 0:
+        problems.append("columns are not numeric: " + ", ".join(nonNumeric))
+    elif len(frame.columns) > 0:
+        values = frame.to_numpy(dtype="float64", na_value=np.nan)
+        if np.isinf(values).any():
+            problems.append("columns hold infinite values: " + ", ".join(frame.columns[np.isinf(values).any(axis=0)]))
+        with np.errstate(invalid="ignore"):
+            invalid = values <= 0 if name == "cryptoPrices" else values < 0 if name == "totalFollowers" else None
+        if invalid is not None and invalid.any():
+            problems.append("columns hold " + ("non-positive" if name == "cryptoPrices" else "negative") +
+                            " values: " + ", ".join(frame.columns[invalid.any(axis=0)]))
+    if len(problems) > 0:
+        raise ValueError("Invalid " + name + " dataframe: " + "; ".join(problems))
+    return frame
+
+
+# floatValues: the values of a frame as a float64 array with missing values as NaN, converting float32 columns
+# stored by compactFrame back into the values they were parsed as (see toFloat64)
+def floatValues(frame):
+    values = frame.to_numpy(dtype="float64", na_value=np.nan)
+    stored = (frame.dtypes == "float32").values
+    if stored.any():
+        values[:, stored] = roundSignificant(values[:, stored])
+    return values
+
+
+# toLong: converts wide dataframes (a dictionary of name -> frame, with names from metrics) into one long frame of
+# (Date, entity, metric, value) rows without missing values, ordered by entity and date, with entity and metric
+# stored as categoricals and values as float64 (see floatValues). The long layout takes less memory than the wide
+# one when accounts and coins are collected over different date ranges, leaving most of the wide frames empty.
+def toLong(frames):
+    entityType = pd.CategoricalDtype(list(dict.fromkeys(str(column) for frame in frames.values()
+                                                        for column in frame.columns)))
+    metricType = pd.CategoricalDtype(list(metrics.values()))
+    parts = []
+    for name, frame in frames.items():
+        values = floatValues(frame)
+        columns, rows = np.nonzero(~np.isnan(values.T))
+        codes = entityType.categories.get_indexer(pd.Index(frame.columns).astype(str))
+        parts.append(pd.DataFrame({
+            "Date": dateIndex(frame.index)[rows],
+            "entity": pd.Categorical.from_codes(codes[columns], dtype=entityType),
+            "metric": pd.Categorical.from_codes(np.full(len(rows), list(metrics).index(name)), dtype=metricType),
+            "value": values[rows, columns]}))
+    if len(parts) == 0:
+        return pd.DataFrame({"Date": pd.DatetimeIndex([]), "entity": pd.Categorical([], dtype=entityType),
+                             "metric": pd.Categorical([], dtype=metricType), "value": np.array([], dtype="float64")})
+    return pd.concat(parts, ignore_index=True)
+
+
+# fromLong: converts the rows of one dataframe (name from metrics) of a long frame back into a compact wide frame
+def fromLong(long, name):
+    rows = long[long["metric"] == metrics[name]]
+    entities = rows["entity"].astype(str)
+    frame = rows.assign(entity=entities).pivot(index="Date", columns="entity", values="value")
+    frame = frame.reindex(columns=list(dict.fromkeys(entities)))
+    frame.columns.name = None
+    if name != "cryptoPrices" and not frame.isna().any().any():
+        frame = frame.astype("int64")
+    return compactFrame(frame)
+
+
+# sizes: memory used by a frame, and the size of its pickle and CSV files, in bytes
+def sizes(frame):
+    pickled = io.BytesIO()
+    frame.to_pickle(pickled)
+    return {"memory": int(frame.memory_usage(deep=True).sum()), "pickle": len(pickled.getvalue()),
+            "csv": len(frame.to_csv().encode("utf-8"))}
+
+
+# main: converts the pickled dataframes in Data/pickled-data to the compact layout, printing their sizes before
+# and after
+def main():
+    for name in metrics:
+        path = "./Data/pickled-data/" + name + "DF.pkl"
+        frame = pd.read_pickle(path)
+        compact = validateFrame(compactFrame(frame), name)
+        before, after = sizes(frame), sizes(compact)
+        print(name + ": " + ", ".join(kind + " " + str(before[kind]) + " -> " + str(after[kind]) + " bytes"
+                                      for kind in before))
+        compact.to_pickle(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# --------------------------------------------------------------------------------------------------------------
+# significance.py:
+# Tests the significance of every correlation of a correlation matrix (and of its average) at once, with block
+# permutation or block bootstrap tests. Each resample correlates the whole assets x accounts matrix in one batched
+# step, resamples are split into chunks with their own seeded random streams that run in a pool of processes, and
+# the p-values are corrected for the number of pairs tested with the Benjamini-Hochberg false discovery rate.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from correlation import pearsonComplete, pearsonPairwise
+from transforms import toArray
+
+
+# methods: the tests available. "permutation" shuffles the order of blocks of dates of the accounts relative to the
+# assets (the correlations expected if the two are unrelated); "bootstrap" resamples blocks of dates of both
+# (the spread of the correlations around their observed values). Blocks keep the day-to-day dependence of the series.
+methods = ["permutation", "bootstrap"]
+
+
+# SignificanceResult: the outcome of testMatrix. correlation, pValues and qValues (p-values corrected with the
+# Benjamini-Hochberg false discovery rate) are dataframes with assets as rows and accounts as columns, and significant
+# marks the pairs with a q-value of at most alpha. average and averagePValue are the average correlation (see
+# correlation.averageCorrelation) and its p-value. For the bootstrap test, standardErrors are the standard deviations
+# of the resampled correlations.
+class SignificanceResult:
+    def __init__(self, correlation, pValues, qValues, alpha, average, averagePValue, method, resamples, blockLength,
+                 standardErrors=None):
+        self.correlation = correlation
+        self.pValues = pValues
+        self.qValues = qValues
+        self.significant = qValues <= alpha
+        self.alpha = alpha
+        self.average = average
+        self.averagePValue = averagePValue
+        self.method = method
+        self.resamples = resamples
+        self.blockLength = blockLength
+        self.standardErrors = standardErrors
+
+    # describe: one-line description of the test, e.g. for the legend of a heatmap
+    def describe(self):
+        return (self.method + " test, " + str(self.resamples) + " resamples of " + str(self.blockLength) +
+                "-day blocks, FDR q ≤ " + "{:g}".format(self.alpha))
+
+
+# blockPermutation: row order shuffling blocks of blockLength consecutive rows (out of `rows`), starting the blocks at
+# a random offset and wrapping around so that the block boundaries differ between resamples
+def blockPermutation(random, rows, blockLength):
+    order = np.roll(np.arange(rows), -random.integers(blockLength))
+    blocks = [order[start:start + blockLength] for start in range(0, rows, blockLength)]
+    return np.concatenate([blocks[i] for i in random.permutation(len(blocks))])
+
+
+# blockBootstrap: row order of a moving block bootstrap: blocks of blockLength consecutive rows starting at random
+# rows, concatenated until there are `rows` rows
+def blockBootstrap(random, rows, blockLength):
+    blockLength = min(blockLength, rows)
+    starts = random.integers(0, rows - blockLength + 1, int(np.ceil(rows / blockLength)))
+    return (starts[:, None] + np.arange(blockLength)).ravel()[:rows]
+
+
+# pearson: correlation of every column of x with every column of y, with the fast path when nothing is missing
+def pearson(x, y):
+    if np.isnan(x).any() or np.isnan(y).any():
+        return pearsonPairwise(x, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.clip(pearsonComplete(x, y), -1, 1)
+
+
+# average: average of a correlation matrix like correlation.averageCorrelation (over assets, then accounts)
+def average(matrix):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # (accounts without any correlation)
+        return np.nanmean(np.nanmean(matrix, axis=0))
+
+
+# resampleChunk: runs `count` resamples of a test with the random stream of seed (a numpy SeedSequence), and returns
+# the sums the p-values are computed from: per pair, the number of resamples at least as extreme as the observed
+# correlation and the number of resamples with a correlation, the same two counts for the average, and the sum and
+# sum of squares of the resampled correlations
+def resampleChunk(x, y, observed, method, blockLength, count, seed):
+    random = np.random.default_rng(seed)
+    rows = len(x)
+    extreme = np.zeros(observed.shape)
+    valid = np.zeros(observed.shape)
+    sums = np.zeros(observed.shape)
+    squares = np.zeros(observed.shape)
+    averageExtreme = 0
+    averageValid = 0
+    observedAverage = average(observed)
+    for _ in range(count):
+        if method == "permutation":
+            resampled = pearson(x, y[blockPermutation(random, rows, blockLength)])
+            # (the correlations expected without any relation are centered on 0)
+            deviations, averageDeviation = resampled, average(resampled)
+        else:
+            order = blockBootstrap(random, rows, blockLength)
+            resampled = pearson(x[order], y[order])
+            # (the resampled correlations are centered on the observed ones, and shifted to 0 to test against)
+            deviations, averageDeviation = resampled - observed, average(resampled) - observedAverage
+        present = ~np.isnan(resampled)
+        with np.errstate(invalid="ignore"):
+            extreme += present & (np.abs(deviations) >= np.abs(observed) - 1e-12)
+        valid += present
+        sums += np.where(present, resampled, 0)
+        squares += np.where(present, resampled ** 2, 0)
+        if not np.isnan(averageDeviation):
+            averageExtreme += abs(averageDeviation) >= abs(observedAverage) - 1e-12
+            averageValid += 1
+    return extreme, valid, sums, squares, averageExtreme, averageValid
+
+
+# workerArrays: the arrays of a worker process, set once per worker by initWorker
+workerArrays = None
+
+
+# initWorker: stores the assets' and accounts' values and the observed correlations in a worker process
+def initWorker(x, y, observed):
+    global workerArrays
+    workerArrays = (x, y, observed)
+
+
+# resampleInWorker: runs a chunk of resamples on the arrays of a worker process
+def resampleInWorker(method, blockLength, count, seed):
+    return resampleChunk(*workerArrays, method, blockLength, count, seed)
+
+
+# benjaminiHochberg: q-values of the p-values of a family of tests (Benjamini-Hochberg adjusted p-values, the smallest
+# false discovery rate at which each test is significant). Missing p-values are left out of the family.
+def benjaminiHochberg(pValues):
+    pValues = np.asarray(pValues, dtype="float64")
+    qValues = np.full(pValues.shape, np.nan)
+    present = ~np.isnan(pValues)
+    tested = pValues[present]
+    if len(tested) == 0:
+        return qValues
+    order = np.argsort(tested)
+    adjusted = tested[order] * len(tested) / np.arange(1, len(tested) + 1)
+    adjusted = np.minimum.accumulate(adjusted[::-1])[::-1]
+    ranked = np.empty(len(tested))
+    ranked[order] = np.minimum(adjusted, 1)
+    qValues[present] = ranked
+    return qValues
+
+
+# testMatrix: tests every correlation between the columns of assetsDF and accountsDF (over their common dates) and
+# their average with `resamples` resamples of the method (see methods), in blocks of blockLength days. Resamples are
+# split into chunks of chunkSize, each with its own random stream spawned from seed, so that the results depend only
+# on the seed and not on the number of processes (the number of CPUs if None; a process that is itself a worker, e.g.
+# rendering figures, runs its chunks itself). p-values are two-sided, with the observed correlation counted as one of
+# the resamples. Returns a SignificanceResult.
+def testMatrix(assetsDF, accountsDF, method="permutation", resamples=1000, blockLength=4, seed=0, alpha=0.05,
+               processes=None, chunkSize=100):
+    if method not in methods:
+        raise ValueError("Unknown significance test: " + method + " (one of " + ", ".join(methods) + ")")
+    assetsDF, accountsDF = assetsDF.align(accountsDF, join="inner", axis=0)
+    x, y = toArray(assetsDF), toArray(accountsDF)
+    observed = pearson(x, y)
+    counts = [min(chunkSize, resamples - start) for start in range(0, resamples, chunkSize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    processes = min(processes or os.cpu_count() or 1, len(counts))
+    if processes <= 1 or multiprocessing.parent_process() is not None:
+        chunks = [resampleChunk(x, y, observed, method, blockLength, count, chunkSeed)
+                  for count, chunkSeed in zip(counts, seeds)]
+    else:
+        with ProcessPoolExecutor(processes, initializer=initWorker, initargs=(x, y, observed)) as executor:
+            chunks = list(executor.map(resampleInWorker, [method] * len(counts), [blockLength] * len(counts), counts,
+                                       seeds))
+    extreme, valid, sums, squares, averageExtreme, averageValid = (sum(parts) for parts in zip(*chunks))
+    pValues = np.where(np.isnan(observed) | (valid == 0), np.nan, (extreme + 1) / (valid + 1))
+    observedAverage = average(observed)
+    averagePValue = (averageExtreme + 1) / (averageValid + 1) if not np.isnan(observedAverage) else np.nan
+    standardErrors = None
+    if method == "bootstrap":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / valid
+            standardErrors = pd.DataFrame(np.sqrt(np.maximum(squares / valid - means ** 2, 0)),
+                                          index=assetsDF.columns, columns=accountsDF.columns)
+
+    def frame(values):
+        return pd.DataFrame(values, index=assetsDF.columns, columns=accountsDF.columns)
+
+    return SignificanceResult(frame(observed), frame(pValues), frame(benjaminiHochberg(pValues)), alpha,
+                              observedAverage, averagePValue, method, resamples, blockLength, standardErrors)
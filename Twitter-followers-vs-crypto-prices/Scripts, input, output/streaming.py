@@ -0,0 +1,226 @@
+# --------------------------------------------------------------------------------------------------------------
+# streaming.py:
+# Keeps rolling-window and exponentially weighted correlations between every cryptocurrency and every Twitter
+# account, updated one day at a time as scraper.py collects new data. Each day costs the same amount of work however
+# long the history and the window are, and the state is saved between runs so that only new days are processed.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import argparse
+from collections import deque
+import os
+import numpy as np
+import pandas as pd
+import columnstore
+from transforms import toArray, toFrame
+
+
+# CoMoments: running means and co-moments of every (asset, account) pair of values, updated with Welford's method.
+# Each pair only counts the days on which both have a value. weight is the number (or total weight) of those days.
+class CoMoments:
+    def __init__(self, assets, accounts):
+        shape = (assets, accounts)
+        self.weight = np.zeros(shape)
+        self.meanX = np.zeros(shape)
+        self.meanY = np.zeros(shape)
+        self.sumXX = np.zeros(shape)
+        self.sumYY = np.zeros(shape)
+        self.sumXY = np.zeros(shape)
+
+    # names: names of the state arrays
+    names = ["weight", "meanX", "meanY", "sumXX", "sumYY", "sumXY"]
+
+    # add: adds one day of values (x for the assets, y for the accounts, NaN where missing)
+    def add(self, x, y):
+        present = ~np.isnan(x)[:, None] & ~np.isnan(y)[None, :]
+        x, y = np.broadcast_to(x[:, None], present.shape), np.broadcast_to(y[None, :], present.shape)
+        weight = self.weight + present
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dx = np.where(present, x - self.meanX, 0)
+            dy = np.where(present, y - self.meanY, 0)
+            meanX = np.where(present, self.meanX + dx / weight, self.meanX)
+            meanY = np.where(present, self.meanY + dy / weight, self.meanY)
+            self.sumXX += np.where(present, dx * (x - meanX), 0)
+            self.sumYY += np.where(present, dy * (y - meanY), 0)
+            self.sumXY += np.where(present, dx * (y - meanY), 0)
+        self.weight, self.meanX, self.meanY = weight, meanX, meanY
+
+    # remove: removes one day of values that was added earlier (the reverse of add)
+    def remove(self, x, y):
+        present = ~np.isnan(x)[:, None] & ~np.isnan(y)[None, :]
+        x, y = np.broadcast_to(x[:, None], present.shape), np.broadcast_to(y[None, :], present.shape)
+        weight = self.weight - present
+        with np.errstate(divide="ignore", invalid="ignore"):
+            meanX = np.where(present, self.meanX - (x - self.meanX) / weight, self.meanX)
+            meanY = np.where(present, self.meanY - (y - self.meanY) / weight, self.meanY)
+            self.sumXX -= np.where(present, (x - meanX) * (x - self.meanX), 0)
+            self.sumYY -= np.where(present, (y - meanY) * (y - self.meanY), 0)
+            self.sumXY -= np.where(present, (x - meanX) * (y - self.meanY), 0)
+        # (pairs left without any days are reset, so that rounding errors don't carry over)
+        empty = weight <= 0
+        self.weight = np.where(empty, 0, weight)
+        self.meanX, self.meanY = np.where(empty, 0, meanX), np.where(empty, 0, meanY)
+        for name in ["sumXX", "sumYY", "sumXY"]:
+            getattr(self, name)[empty] = 0
+
+    # decay: multiplies the weight of every day added so far by factor (the means don't change)
+    def decay(self, factor):
+        for name in ["weight", "sumXX", "sumYY", "sumXY"]:
+            getattr(self, name)[...] *= factor
+
+    # correlation: correlation of every pair (NaN for pairs with less than minimumWeight days, or without variation)
+    def correlation(self, minimumWeight=2):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = self.sumXY / np.sqrt(self.sumXX * self.sumYY)
+        # (a pair whose values are constant can be left with a tiny variance by rounding instead of exactly 0)
+        constant = (self.sumXX <= 1e-12 * self.weight * self.meanX ** 2) | \
+            (self.sumYY <= 1e-12 * self.weight * self.meanY ** 2)
+        correlation[constant | (self.weight < minimumWeight)] = np.nan
+        return np.clip(correlation, -1, 1)
+
+    # extend: adds empty pairs for new assets and accounts at the end
+    def extend(self, assets, accounts):
+        for name in self.names:
+            array = getattr(self, name)
+            setattr(self, name, np.pad(array, ((0, assets - array.shape[0]), (0, accounts - array.shape[1]))))
+
+
+# CorrelationTracker: correlations between the assets (e.g. crypto prices) and accounts (e.g. followers) over a
+# rolling window of the last `window` calendar days, and exponentially weighted with a half-life of `halflife` days.
+# Days are added in date order with update. Missing days leave the window (and the exponential weights decay) by
+# date, so a gap shortens the window instead of widening it. The values of the days in the window are kept in ring
+# buffers of `window` rows, so that they can be removed when they leave it without copying the others.
+class CorrelationTracker:
+    def __init__(self, assets, accounts, window=28, halflife=7):
+        self.assets = list(assets)
+        self.accounts = list(accounts)
+        self.window = window
+        self.halflife = halflife
+        self.rolling = CoMoments(len(self.assets), len(self.accounts))
+        self.weighted = CoMoments(len(self.assets), len(self.accounts))
+        self.dates = deque()
+        self.head = 0  # (row of the ring buffers holding the oldest day in the window)
+        self.bufferX = np.full((window, len(self.assets)), np.nan)
+        self.bufferY = np.full((window, len(self.accounts)), np.nan)
+
+    # lastDate: the last date added (None if no days have been added)
+    def lastDate(self):
+        return self.dates[-1] if len(self.dates) > 0 else None
+
+    # extend: starts tracking assets and accounts that weren't tracked yet
+    def extend(self, assets, accounts):
+        newAssets = [asset for asset in assets if asset not in self.assets]
+        newAccounts = [account for account in accounts if account not in self.accounts]
+        if len(newAssets) == 0 and len(newAccounts) == 0:
+            return
+        self.assets += newAssets
+        self.accounts += newAccounts
+        for moments in [self.rolling, self.weighted]:
+            moments.extend(len(self.assets), len(self.accounts))
+        self.bufferX = np.pad(self.bufferX, ((0, 0), (0, len(newAssets))), constant_values=np.nan)
+        self.bufferY = np.pad(self.bufferY, ((0, 0), (0, len(newAccounts))), constant_values=np.nan)
+
+    # update: adds one day of values (Series indexed by asset and by account; missing values are ignored, and new
+    # assets or accounts start being tracked), first removing the days that are `window` or more days older from the
+    # rolling window. Days must be added in date order: days up to the last date added are skipped, and False is
+    # returned.
+    def update(self, date, assetValues, accountValues):
+        date = pd.Timestamp(date)
+        lastDate = self.lastDate()
+        if lastDate is not None and date <= lastDate:
+            return False
+        self.extend(assetValues.index, accountValues.index)
+        x = assetValues.reindex(self.assets).to_numpy(dtype="float64", na_value=np.nan)
+        y = accountValues.reindex(self.accounts).to_numpy(dtype="float64", na_value=np.nan)
+        while len(self.dates) > 0 and self.dates[0] <= date - pd.Timedelta(days=self.window):
+            self.rolling.remove(self.bufferX[self.head], self.bufferY[self.head])
+            self.dates.popleft()
+            self.head = (self.head + 1) % self.window
+        self.rolling.add(x, y)
+        days = (date - lastDate) / pd.Timedelta(days=1) if lastDate is not None else 1
+        self.weighted.decay(0.5 ** (days / self.halflife))
+        self.weighted.add(x, y)
+        position = (self.head + len(self.dates)) % self.window
+        self.bufferX[position], self.bufferY[position] = x, y
+        self.dates.append(date)
+        return True
+
+    # updateFrames: adds every day of two dataframes (assets and accounts, indexed by date) after the last date
+    # added. Returns the number of days added.
+    def updateFrames(self, assetsDF, accountsDF):
+        assetsDF, accountsDF = toFrame(assetsDF, toArray(assetsDF)), toFrame(accountsDF, toArray(accountsDF))
+        assetsDF, accountsDF = assetsDF.align(accountsDF, join="outer", axis=0)
+        added = 0
+        for date, assetValues, accountValues in zip(assetsDF.index, assetsDF.itertuples(index=False),
+                                                    accountsDF.itertuples(index=False)):
+            added += self.update(date, pd.Series(assetValues, index=assetsDF.columns),
+                                 pd.Series(accountValues, index=accountsDF.columns))
+        return added
+
+    # rollingMatrix: correlations over the rolling window (assets as rows, accounts as columns)
+    def rollingMatrix(self):
+        return pd.DataFrame(self.rolling.correlation(), index=self.assets, columns=self.accounts)
+
+    # weightedMatrix: exponentially weighted correlations (assets as rows, accounts as columns)
+    def weightedMatrix(self):
+        return pd.DataFrame(self.weighted.correlation(minimumWeight=1), index=self.assets, columns=self.accounts)
+
+    # save: writes the state to an npz file (with the days in the ring buffers in date order)
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {"rolling_" + name: getattr(self.rolling, name) for name in CoMoments.names}
+        arrays.update({"weighted_" + name: getattr(self.weighted, name) for name in CoMoments.names})
+        temporaryPath = path + ".tmp.npz"
+        order = (self.head + np.arange(len(self.dates))) % self.window  # (the days in the window, oldest first)
+        np.savez(temporaryPath, assets=np.array(self.assets, dtype="str"),
+                 accounts=np.array(self.accounts, dtype="str"), settings=np.array([self.window, self.halflife]),
+                 dates=np.array(self.dates, dtype="datetime64[D]"), bufferX=self.bufferX[order],
+                 bufferY=self.bufferY[order],
+                 **arrays)
+        os.replace(temporaryPath, path)
+
+    # load: reads a tracker saved with save
+    @staticmethod
+    def load(path):
+        with np.load(path) as state:
+            window, halflife = state["settings"]
+            tracker = CorrelationTracker(state["assets"].tolist(), state["accounts"].tolist(), int(window), halflife)
+            for name in CoMoments.names:
+                setattr(tracker.rolling, name, state["rolling_" + name])
+                setattr(tracker.weighted, name, state["weighted_" + name])
+            tracker.dates = deque(pd.Timestamp(date) for date in state["dates"])
+            tracker.bufferX[:len(tracker.dates)] = state["bufferX"]
+            tracker.bufferY[:len(tracker.dates)] = state["bufferY"]
+        return tracker
+
+
+# main: updates the saved trackers of crypto prices vs total and new followers with the days collected since the
+# last run, and prints their average correlations
+def main():
+    parser = argparse.ArgumentParser(description="Updates the rolling and exponentially weighted correlations with "
+                                                 "the days collected since the last run")
+    parser.add_argument("--data", default="./Data", metavar="DIRECTORY",
+                        help="folder the data is read from (the trackers are saved in DATA/streaming)")
+    arguments = parser.parse_args()
+    window = 28
+    halflife = 7
+    cryptoPricesDF = columnstore.loadFrame("cryptoPrices", dataDirectory=arguments.data)
+    for name in ["totalFollowers", "newFollowers"]:
+        path = os.path.join(arguments.data, "streaming", name + ".npz")
+        if os.path.exists(path):
+            tracker = CorrelationTracker.load(path)
+        else:
+            tracker = CorrelationTracker(cryptoPricesDF.columns, [], window, halflife)
+        added = tracker.updateFrames(cryptoPricesDF, columnstore.loadFrame(name, dataDirectory=arguments.data))
+        tracker.save(path)
+        print(name + ": " + str(added) + " new days (last date " + str(tracker.lastDate().date()) + "), average " +
+              str(tracker.window) + "-day correlation " + "{:.3f}".format(tracker.rollingMatrix().mean().mean()) +
+              ", exponentially weighted (half-life " + str(tracker.halflife) + " days) " +
+              "{:.3f}".format(tracker.weightedMatrix().mean().mean()))
+
+
+if __name__ == "__main__":
+    main()
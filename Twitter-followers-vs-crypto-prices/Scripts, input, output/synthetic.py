@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------------------------
+# synthetic.py:
+# Generates synthetic data with the same layout as the dataframes collected by scraper.py (crypto prices, total
+# followers and daily new followers, indexed by date), at any number of accounts, days and coins, for benchmark.py
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+
+# scales: named sizes of synthetic data as (accounts, days, coins); "collected" is the size of the collected data
+scales = {"collected": (83, 28, 10), "medium": (1000, 365, 20), "large": (5000, 1500, 50)}
+
+
+# parseScale: reads a scale given by name or as ACCOUNTSxDAYSxCOINS, e.g. "1000x365x20"
+def parseScale(scale):
+    if scale in scales:
+        return scales[scale]
+    try:
+        accounts, days, coins = (int(part) for part in scale.lower().split("x"))
+    except ValueError:
+        raise ValueError("Scales are " + ", ".join(scales) + " or ACCOUNTSxDAYSxCOINS, not " + scale)
+    return accounts, days, coins
+
+
+# syntheticFrames: returns (cryptoPricesDF, totalFollowersDF, newFollowersDF) for the given numbers of accounts,
+# days and coins. Like the collected data, they are indexed by a datetime64 "Date" index, follower counts are
+# int64 and prices are float64. Starting follower counts are spread over several orders of magnitude, daily new
+# followers grow with the account size, and prices follow random walks from prices between 1e-5 and 1e4.
+def syntheticFrames(accounts, days, coins, start="2022-08-15", seed=0):
+    random = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=days, name="Date")
+    startingFollowers = np.round(10 ** random.uniform(3, 8, accounts)).astype("int64")
+    growth = random.normal(0.0005, 0.002, accounts)
+    noise = random.normal(0, 0.001, (days, accounts))
+    newFollowers = np.round(startingFollowers * (growth + noise)).astype("int64")
+    totalFollowers = startingFollowers + np.cumsum(newFollowers, axis=0)
+    startingPrices = 10 ** random.uniform(-5, 4, coins)
+    returns = random.normal(0, 0.04, (days, coins))
+    returns[0] = 0
+    prices = startingPrices * np.exp(np.cumsum(returns, axis=0))
+    accountNames = ["account" + str(i).zfill(len(str(accounts))) for i in range(accounts)]
+    coinNames = ["coin" + str(i).zfill(len(str(coins))) for i in range(coins)]
+    return (pd.DataFrame(prices, index=dates, columns=coinNames),
+            pd.DataFrame(totalFollowers, index=dates, columns=accountNames),
+            pd.DataFrame(newFollowers, index=dates, columns=accountNames))
+
+
+# main: saves synthetic data as pickled dataframes, in the layout of Data/pickled-data
+def main():
+    parser = argparse.ArgumentParser(description="Saves synthetic data in the layout of Data/pickled-data")
+    parser.add_argument("--scale", default="medium", help="one of " + ", ".join(scales) + ", or ACCOUNTSxDAYSxCOINS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="./Benchmarks/synthetic-data")
+    arguments = parser.parse_args()
+    accounts, days, coins = parseScale(arguments.scale)
+    os.makedirs(arguments.output, exist_ok=True)
+    for name, frame in zip(["cryptoPrices", "totalFollowers", "newFollowers"],
+                           syntheticFrames(accounts, days, coins, seed=arguments.seed)):
+        frame.to_pickle(os.path.join(arguments.output, name + "DF.pkl"))
+
+
+if __name__ == "__main__":
+    main()
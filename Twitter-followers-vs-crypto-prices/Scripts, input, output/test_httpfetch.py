@@ -0,0 +1,168 @@
+# --------------------------------------------------------------------------------------------------------------
+# test_httpfetch.py:
+# Tests of httpfetch.py (and of the retries of scheduler.py through it) against a local HTTP server serving the
+# fixture pages in Benchmarks/Fixtures, run with "python -m pytest" from this folder
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import aiohttp
+import pytest
+from httpfetch import HttpFetcher
+from scheduler import ScrapeJob, ScrapeScheduler
+
+fixtureDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Benchmarks", "Fixtures")
+
+
+# FixtureHandler: serves the fixture pages by file name (e.g. /socialblade-elonmusk.html), with a few extra paths:
+# /slow/NAME waits before answering (to count the requests in flight), /flaky/N/NAME fails with a 503 the first N
+# times it is requested, and any other path is a 404. Query strings are ignored, so that URLs of the same page can
+# differ. Keeps connections alive, so that their reuse can be checked.
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.inFlight += 1
+            server.maxInFlight = max(server.maxInFlight, server.inFlight)
+        try:
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if parts[0] == "slow":
+                time.sleep(0.2)
+                parts = parts[1:]
+            elif parts[0] == "flaky":
+                with server.lock:
+                    server.failures[self.path] = server.failures.get(self.path, 0) + 1
+                    failing = server.failures[self.path] <= int(parts[1])
+                if failing:
+                    return self.answer(503, b"unavailable")
+                parts = parts[2:]
+            path = os.path.join(fixtureDirectory, "/".join(parts))
+            if len(parts) != 1 or not os.path.isfile(path):
+                return self.answer(404, b"not found")
+            with open(path, "rb") as file:
+                self.answer(200, file.read())
+        finally:
+            with server.lock:
+                server.inFlight -= 1
+
+    # answer: sends a response with a body of bytes
+    def answer(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *arguments):
+        pass
+
+
+# runningServer: a local fixture server running in a background thread for the tests of this module
+@pytest.fixture(scope="module")
+def runningServer():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# server: the fixture server, with its request statistics reset for each test
+@pytest.fixture
+def server(runningServer):
+    with runningServer.lock:
+        runningServer.connections = set()
+        runningServer.failures = {}
+        runningServer.inFlight = 0
+        runningServer.maxInFlight = 0
+    return runningServer
+
+
+# url: the URL of a path on the fixture server
+def url(server, path):
+    return "http://127.0.0.1:" + str(server.server_address[1]) + "/" + path
+
+
+# fixture: the text of a fixture page
+def fixture(name):
+    with open(os.path.join(fixtureDirectory, name), encoding="utf-8") as file:
+        return file.read()
+
+
+# names: the fixture pages served
+names = sorted(os.listdir(fixtureDirectory))
+
+
+def test_fetch_returns_page(server):
+    with HttpFetcher() as fetcher:
+        assert fetcher.fetch(url(server, names[0])) == fixture(names[0])
+
+
+def test_fetchAll_returns_every_page_once(server):
+    URLs = [url(server, name) for name in names]
+    with HttpFetcher() as fetcher:
+        pages = fetcher.fetchAll(URLs + URLs[:1])
+    assert list(pages) == URLs
+    assert all(pages[url(server, name)] == fixture(name) for name in names)
+
+
+def test_synchronous_calls_reuse_connection(server):
+    with HttpFetcher(concurrency=1, perHost=1) as fetcher:
+        for name in names:
+            fetcher.fetch(url(server, name))
+        session = fetcher.session
+        fetcher.fetchAll([url(server, name) for name in names])
+        assert fetcher.session is session
+    assert len(server.connections) == 1
+    assert fetcher.session is None and fetcher.loop is None
+
+
+def test_fetch_raises_on_error_status(server):
+    with HttpFetcher() as fetcher:
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            fetcher.fetch(url(server, "missing.html"))
+        assert error.value.status == 404
+        assert fetcher.fetch(url(server, names[0])) == fixture(names[0])
+
+
+def test_fetchAll_raises_if_any_page_fails(server):
+    with HttpFetcher() as fetcher:
+        with pytest.raises(aiohttp.ClientResponseError):
+            fetcher.fetchAll([url(server, names[0]), url(server, "flaky/1/" + names[1])])
+
+
+@pytest.mark.parametrize("concurrency, perHost, limit", [(2, 4, 2), (8, 3, 3)])
+def test_requests_in_flight_are_limited(server, concurrency, perHost, limit):
+    URLs = [url(server, "slow/" + names[0] + "?" + str(i)) for i in range(8)]
+    with HttpFetcher(concurrency=concurrency, perHost=perHost) as fetcher:
+        pages = fetcher.fetchAll(URLs)
+    assert len(pages) == 8
+    assert server.maxInFlight == limit
+
+
+def test_scheduler_retries_failed_fetches(server):
+    jobs = [ScrapeJob(name, url(server, "flaky/2/" + name), len) for name in names]
+    scheduler = ScrapeScheduler(HttpFetcher(), defaultRate=1000, retries=2, backoff=0)
+    results, failures = scheduler.run(jobs)
+    assert failures == {}
+    assert results == {name: len(fixture(name)) for name in names}
+
+
+def test_scheduler_reports_jobs_failing_every_retry(server):
+    jobs = [ScrapeJob("missing", url(server, "missing.html"), len), ScrapeJob(names[0], url(server, names[0]), len)]
+    scheduler = ScrapeScheduler(HttpFetcher(), defaultRate=1000, retries=1, backoff=0)
+    results, failures = scheduler.run(jobs)
+    assert results == {names[0]: len(fixture(names[0]))}
+    assert isinstance(failures["missing"], aiohttp.ClientResponseError)
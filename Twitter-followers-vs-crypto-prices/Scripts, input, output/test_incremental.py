@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------------------------
+# test_incremental.py:
+# Tests of the incremental updates of scraper.py: incremental.py reads the history from the column store or the
+# pickled dataframes and merges new rows into it, and incremental writes to the column store keep older months.
+# Run with "python -m pytest" from this folder.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import columnstore
+from incremental import loadHistory, mergeFrame, newRows
+
+
+# followersFrame: a frame of follower counts over `days` days from start
+def followersFrame(start="2022-07-20", days=40, accounts=("elonmusk", "JoeDiPasquale")):
+    dates = pd.date_range(start, periods=days, freq="D", name="Date")
+    return pd.DataFrame({account: 100_000 * (number + 1) + 10 * np.arange(days)
+                         for number, account in enumerate(accounts)}, index=dates).astype("int32")
+
+
+# months: the month partitions of a frame in the column store of dataDirectory
+def months(dataDirectory, name):
+    return sorted(os.listdir(os.path.join(dataDirectory, "arrow-data", name)))
+
+
+def test_history_is_empty_before_the_first_run(tmp_path):
+    assert loadHistory("totalFollowers", str(tmp_path)).empty
+    assert loadHistory("totalFollowers", None).empty
+
+
+@pytest.mark.parametrize("store", ["arrow", "pickle"])
+def test_history_is_read_from_either_store(tmp_path, store):
+    frame = followersFrame()
+    if store == "arrow":
+        columnstore.writeFrame(frame, "totalFollowers", str(tmp_path / "arrow-data"))
+    else:
+        os.makedirs(tmp_path / "pickled-data")
+        frame.to_pickle(str(tmp_path / "pickled-data" / "totalFollowersDF.pkl"))
+    pd.testing.assert_frame_equal(loadHistory("totalFollowers", str(tmp_path)), frame, check_freq=False)
+
+
+def test_incremental_write_keeps_earlier_months(tmp_path):
+    root = str(tmp_path / "arrow-data")
+    columnstore.writeFrame(followersFrame(), "totalFollowers", root)
+    assert months(tmp_path, "totalFollowers") == ["2022-07.arrow", "2022-08.arrow"]
+    columnstore.writeFrame(followersFrame("2022-08-10", 30), "totalFollowers", root, keepEarlier=True)
+    assert months(tmp_path, "totalFollowers") == ["2022-07.arrow", "2022-08.arrow", "2022-09.arrow"]
+    columnstore.writeFrame(followersFrame("2022-08-10", 10), "totalFollowers", root)
+    assert months(tmp_path, "totalFollowers") == ["2022-08.arrow"]
+
+
+def test_new_rows_only_fill_missing_dates():
+    history = followersFrame(days=30).astype("float64")
+    history.iloc[3, 1] = np.nan
+    scraped = followersFrame(days=40, accounts=("elonmusk", "JoeDiPasquale", "VitalikButerin")) + 1
+    rows = newRows(history, scraped.index, {name: scraped[name].to_numpy() for name in scraped.columns})
+    assert [len(rows[name]) for name in scraped.columns] == [10, 11, 40]
+    merged = mergeFrame(history, rows)
+    assert list(merged.columns) == list(scraped.columns)
+    kept = history.drop(index=history.index[3])
+    pd.testing.assert_frame_equal(merged.iloc[:30, :2].drop(index=merged.index[3]), kept, check_freq=False)
+    assert merged.iloc[3, 1] == scraped.iloc[3, 1]
+    assert (merged.iloc[30:] == scraped.iloc[30:]).all().all()
+    assert merged["VitalikButerin"].dtype == np.int32
@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------------------------
+# test_sqlsink.py:
+# Tests of sqlsink.py on a temporary SQLite database: exports are idempotent upserts, and reading the long table back
+# gives the wide frames that were written. Run with "python -m pytest" from this folder.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, postgresql
+import sqlsink
+from schema import compactFrame, dateIndex, floatValues, metrics
+
+
+# engine: an engine of an empty SQLite database in a temporary folder, with the observations table created
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlsink.newEngine("sqlite:///" + str(tmp_path / "test.db"))
+    sqlsink.createTables(engine)
+    yield engine
+    engine.dispose()
+
+
+# pricesFrame: a compact frame of crypto prices (stored as float32 where no digits are lost, like scraper.py stores
+# them) over `days` days from start, with a missing price
+def pricesFrame(start="2022-09-01", days=10):
+    dates = pd.date_range(start, periods=days, freq="D")
+    frame = pd.DataFrame({"bitcoin": np.round(np.linspace(19500.5, 20400.25, days), 2),
+                          "shiba-inu": np.linspace(0.0000112, 0.0000131, days).round(9),
+                          "terra-luna-v2": np.linspace(2.51, 3.05, days).round(4)}, index=dates)
+    frame.iloc[3, 2] = np.nan
+    return compactFrame(frame)
+
+
+# followersFrame: a compact frame of follower counts over `days` days from start
+def followersFrame(start="2022-09-01", days=10):
+    dates = pd.date_range(start, periods=days, freq="D")
+    return compactFrame(pd.DataFrame({"elonmusk": 107_000_000 + 150_000 * np.arange(days),
+                                      "JoeDiPasquale": 52_000 + 12 * np.arange(days)}, index=dates))
+
+
+# expected: the frame readFrame should return for a written frame: float64 values (float32 prices converted back
+# exactly), entities in alphabetical order, without the dates on which every value is missing
+def expected(frame):
+    values = pd.DataFrame(floatValues(frame), index=dateIndex(frame.index), columns=frame.columns)
+    return values.reindex(columns=sorted(values.columns)).dropna(how="all")
+
+
+# rowCount: the number of rows of the observations table
+def rowCount(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(sqlsink.observations)).scalar()
+
+
+def test_round_trip(engine):
+    frame = pricesFrame()
+    written = sqlsink.writeFrame(engine, frame, metrics["cryptoPrices"])
+    assert written == frame.notna().sum().sum() == rowCount(engine)
+    pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics["cryptoPrices"]), expected(frame))
+
+
+def test_writing_again_is_idempotent(engine):
+    frame = followersFrame()
+    sqlsink.writeFrame(engine, frame, metrics["totalFollowers"])
+    sqlsink.writeFrame(engine, frame, metrics["totalFollowers"], chunkSize=7)
+    assert rowCount(engine) == frame.size
+    pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics["totalFollowers"]), expected(frame))
+
+
+def test_overlapping_dates_are_updated(engine):
+    first = followersFrame("2022-09-01", 10)
+    second = followersFrame("2022-09-06", 10) + 1
+    sqlsink.writeFrame(engine, first, metrics["totalFollowers"])
+    sqlsink.writeFrame(engine, second, metrics["totalFollowers"])
+    merged = pd.concat([first.iloc[:5], second])
+    assert rowCount(engine) == merged.size
+    pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics["totalFollowers"]), expected(merged))
+
+
+def test_since_only_writes_later_dates(engine):
+    frame = pricesFrame()
+    written = sqlsink.writeFrame(engine, frame, metrics["cryptoPrices"], since="2022-09-08")
+    assert written == 9
+    pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics["cryptoPrices"]), expected(frame.iloc[7:]))
+
+
+def test_exportFrames_keeps_metrics_apart(engine):
+    prices, totals = pricesFrame(), followersFrame()
+    changes = compactFrame(totals.astype("int64").diff().fillna(0).astype("int64"))
+    written = sqlsink.exportFrames(engine, prices, totals, changes)
+    assert written == rowCount(engine) == prices.notna().sum().sum() + totals.size + changes.size
+    assert sqlsink.exportFrames(engine, prices, totals, changes) == written
+    assert rowCount(engine) == written
+    for name, frame in [("cryptoPrices", prices), ("totalFollowers", totals), ("newFollowers", changes)]:
+        pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics[name]), expected(frame))
+    pd.testing.assert_frame_equal(sqlsink.readFrame(engine, metrics["totalFollowers"], ["elonmusk"]),
+                                  expected(totals[["elonmusk"]]))
+
+
+@pytest.mark.parametrize("dialect, clause", [(postgresql.dialect(), "ON CONFLICT (date, entity, metric) DO UPDATE"),
+                                             (mysql.dialect(), "ON DUPLICATE KEY UPDATE")])
+def test_upsert_statement_of_other_databases(dialect, clause):
+    statement = sqlsink.upsertStatement(SimpleNamespace(dialect=dialect))
+    assert clause in str(statement.compile(dialect=dialect))
+
+
+def test_unsupported_database():
+    with pytest.raises(ValueError):
+        sqlsink.upsertStatement(SimpleNamespace(dialect=SimpleNamespace(name="oracle")))
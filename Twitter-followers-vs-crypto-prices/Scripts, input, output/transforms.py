@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------------------------
+# transforms.py:
+# Column-wise transforms of the dataframes analyzed in matplotlib-analysis.py (rescaling, normalizing, z-scores,
+# returns), each computed on the whole dataframe at once with NumPy. Missing values are ignored.
+
+# GitHub project link:
+# https://github.com/antonshpak100/Data-Analysis-Portfolio/tree/main/Twitter-followers-vs-crypto-prices
+# --------------------------------------------------------------------------------------------------------------
+
+# importing libraries
+import numpy as np
+import pandas as pd
+from schema import floatValues
+
+
+# toArray: returns the values of a dataframe as a float64 array, with missing values as NaN (prices stored as float32
+# are converted back into the values they were scraped as, see schema.py)
+def toArray(frame):
+    return floatValues(frame)
+
+
+# toFrame: wraps an array of transformed values in a dataframe with the labels of the original dataframe
+def toFrame(frame, values):
+    return pd.DataFrame(values, index=frame.index, columns=frame.columns)
+
+
+# firstValid: returns the first non-missing value of each column (NaN for columns with no values)
+def firstValid(values):
+    if len(values) == 0:
+        return np.full(values.shape[1], np.nan)
+    rows = np.argmax(~np.isnan(values), axis=0)
+    return values[rows, np.arange(values.shape[1])]
+
+
+# rescale: rescales each column so that 1 represents its starting value (its first value, or its first collected
+# value for columns that start later) and the following values become the ratio of the value to the starting value
+def rescale(frame):
+    values = toArray(frame)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return toFrame(frame, values / firstValid(values))
+
+
+# rebase: rescales each column so that 1 represents its value on the given date
+def rebase(frame, date):
+    values = toArray(frame)
+    row = pd.DatetimeIndex(pd.to_datetime(frame.index)).get_loc(pd.Timestamp(date))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return toFrame(frame, values / values[row])
+
+
+# normalize: rescales each column so that 1 represents its maximum value and 0 represents its minimum value
+def normalize(frame):
+    values = toArray(frame)
+    if len(values) == 0:
+        return toFrame(frame, values)
+    minimum = np.fmin.reduce(values, axis=0)  # (fmin and fmax ignore NaN)
+    maximum = np.fmax.reduce(values, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return toFrame(frame, (values - minimum) / (maximum - minimum))
+
+
+# zscore: standardizes each column to mean 0 and standard deviation 1 (sample standard deviation by default)
+def zscore(frame, ddof=1):
+    values = toArray(frame)
+    present = ~np.isnan(values)
+    count = present.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(present, values, 0).sum(axis=0) / count
+        deviations = np.where(present, values - mean, 0)
+        std = np.sqrt((deviations ** 2).sum(axis=0) / (count - ddof))
+        return toFrame(frame, (values - mean) / std)
+
+
+# pctChange: relative change of each column from `periods` rows earlier (NaN for the first rows)
+def pctChange(frame, periods=1):
+    values = toArray(frame)
+    changes = np.full(values.shape, np.nan)
+    if periods < len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes[periods:] = values[periods:] / values[:-periods] - 1
+    return toFrame(frame, changes)
+
+
+# logReturn: logarithm of the ratio of each value to the value `periods` rows earlier (NaN for the first rows, and
+# where the ratio isn't positive, e.g. for negative daily new followers)
+def logReturn(frame, periods=1):
+    values = toArray(frame)
+    returns = np.full(values.shape, np.nan)
+    if periods < len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = values[periods:] / values[:-periods]
+            returns[periods:] = np.log(np.where(ratios > 0, ratios, np.nan))
+    return toFrame(frame, returns)